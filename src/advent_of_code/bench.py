@@ -0,0 +1,181 @@
+import json
+import subprocess
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from statistics import median, quantiles
+from typing import TYPE_CHECKING
+
+from .problems import PuzzleData
+from .runner import CACHE_DIR, Outcome, run_puzzle, try_run_puzzle
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+BENCH_FILE = CACHE_DIR / "bench.jsonl"
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    puzzle_data: PuzzleData
+    commit: str
+    timestamp: str
+    runs: int
+    # None when the actual solution isn't known.
+    correct: bool | None
+    # Wall time (in ns) and memory usage (in bytes)
+    min: int
+    median: int
+    p95: int
+    peak_memory: int
+    # The exception a run raised, if any (nothing measured then).
+    error: str | None = None
+
+    @classmethod
+    def from_dict(cls, d: dict) -> Benchmark:
+        return cls(**(d | {"puzzle_data": PuzzleData(**d["puzzle_data"])}))
+
+
+@dataclass(frozen=True)
+class Comparison:
+    benchmark: Benchmark
+    baseline: Benchmark | None
+    threshold: float
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline or not self.baseline.median:
+            return None
+        return self.benchmark.median / self.baseline.median
+
+    @property
+    def is_regression(self) -> bool:
+        ratio = self.ratio
+        return ratio is not None and ratio > 1 + self.threshold
+
+
+def current_commit() -> str:
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def peak_memory(puzzle_data: PuzzleData) -> int:
+    """Peak memory (in bytes) allocated while solving the puzzle."""
+    tracemalloc.start()
+    try:
+        run_puzzle(puzzle_data, fresh=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_puzzle(
+    puzzle_data: PuzzleData, *, runs: int, warmup: int, commit: str
+) -> Benchmark:
+    """
+    Benchmark a puzzle by solving it multiple times.
+
+    Timing runs are preceded by warmup runs and followed by a separate run to
+    measure memory usage (tracing allocations slows things down considerably).
+    If any run fails, the benchmark records the error instead of measurements.
+    """
+    timestamp = datetime.now(UTC).isoformat(timespec="seconds")
+
+    def failed(outcome: Outcome) -> Benchmark:
+        return Benchmark(
+            puzzle_data,
+            commit=commit,
+            timestamp=timestamp,
+            runs=runs,
+            correct=False,
+            min=0,
+            median=0,
+            p95=0,
+            peak_memory=0,
+            error=outcome.error,
+        )
+
+    for _ in range(warmup):
+        if (outcome := try_run_puzzle(puzzle_data, fresh=True)).error:
+            return failed(outcome)
+
+    # Every run solves the puzzle from scratch: nothing shared between runs.
+    outcomes = [try_run_puzzle(puzzle_data, fresh=True) for _ in range(runs)]
+    if errors := [o for o in outcomes if o.error]:
+        return failed(errors[0])
+    times = sorted(o.duration for o in outcomes)
+    p95 = quantiles(times, n=20, method="inclusive")[-1] if runs > 1 else times[0]
+
+    return Benchmark(
+        puzzle_data,
+        commit=commit,
+        timestamp=timestamp,
+        runs=runs,
+        correct=(
+            all(o.is_correct for o in outcomes)
+            if all(o.is_verified for o in outcomes)
+            else None
+        ),
+        min=times[0],
+        median=int(median(times)),
+        p95=int(p95),
+        peak_memory=peak_memory(puzzle_data),
+    )
+
+
+def load_benchmarks() -> Iterator[Benchmark]:
+    try:
+        with BENCH_FILE.open(encoding="utf8") as f:
+            for line in f:
+                yield Benchmark.from_dict(json.loads(line))
+    except FileNotFoundError:
+        return
+
+
+def save_benchmarks(benchmarks: Iterable[Benchmark]) -> None:
+    CACHE_DIR.mkdir(exist_ok=True)
+    with BENCH_FILE.open("a", encoding="utf8") as f:
+        f.writelines(f"{json.dumps(asdict(b))}\n" for b in benchmarks)
+
+
+def find_baselines(commit: str, baseline_commit: str = None) -> dict[str, Benchmark]:
+    """
+    Most recent stored benchmark per puzzle to compare against.
+
+    By default this is the latest one made at a different commit than the current.
+    """
+    baselines = {}
+    for b in load_benchmarks():
+        if b.commit == baseline_commit if baseline_commit else b.commit != commit:
+            baselines[b.puzzle_data.key] = b
+    return baselines
+
+
+def bench_all(
+    puzzles: Iterable[PuzzleData],
+    *,
+    runs: int,
+    warmup: int,
+    threshold: float,
+    baseline_commit: str = None,
+) -> list[Comparison]:
+    commit = current_commit()
+    baselines = find_baselines(commit, baseline_commit)
+    benchmarks = [
+        bench_puzzle(puzzle_data, runs=runs, warmup=warmup, commit=commit)
+        for puzzle_data in puzzles
+    ]
+    # Failed benchmarks measured nothing: no use as a baseline.
+    save_benchmarks(b for b in benchmarks if not b.error)
+    return [
+        Comparison(b, baselines.get(b.puzzle_data.key), threshold) for b in benchmarks
+    ]
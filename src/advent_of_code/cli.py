@@ -1,24 +1,41 @@
 import sys
 from argparse import ArgumentParser, Namespace
 from datetime import UTC, datetime
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from based_utils.cli import (
     LogLevel,
     Table,
+    check_integer_in_range,
     human_readable_duration,
     killed_by_errors,
-    timed,
 )
 from kleur.formatting import FAIL, OK, Colored
 
 from advent_of_code import C
 
 from . import log
-from .problems import InputMode, NoSolutionFoundError, PuzzleData, load_problem
+from .problems import (
+    PKG_NAME,
+    InputMode,
+    NoSolutionFoundError,
+    PuzzleData,
+    find_puzzles,
+)
+from .runner import (
+    Durations,
+    Outcome,
+    report_entries,
+    run_all,
+    run_puzzle,
+    write_report,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
+
+    from .bench import Benchmark, Comparison
 
 
 def solution_lines[T](my_solution: T, actual_solution: T | None) -> Iterator[str]:
@@ -60,7 +77,7 @@ def solution_lines[T](my_solution: T, actual_solution: T | None) -> Iterator[str
             yield from actual
 
 
-def duration_lines(duration: int) -> Iterator[str]:
+def duration_with_emoji(duration: int) -> str:
     duration_str = human_readable_duration(duration)
     if duration_str.endswith("minutes"):
         emoji = "🦥"
@@ -70,40 +87,201 @@ def duration_lines(duration: int) -> Iterator[str]:
         emoji = "🐇"
     else:
         emoji = "🚀"
-    yield f"Solved in {duration_str} {emoji}"
+    return f"{duration_str} {emoji}"
+
+
+def phases(durations: Durations) -> dict[str, int]:
+    return {
+        "Input": durations.read_input,
+        "Parsing": durations.parse_input,
+        "Init": durations.init,
+        "Solution": durations.solution,
+    }
+
+
+def duration_lines(durations: Durations) -> Iterator[str]:
+    yield f"Solved in {duration_with_emoji(durations.total)}"
+    yield ""
+    phase_durations = phases(durations)
+    w = max(len(phase) for phase in phase_durations)
+    for phase, duration in phase_durations.items():
+        yield f"{phase.ljust(w)} {human_readable_duration(duration)}"
 
 
 def output_lines[T](
-    my_solution: T, actual_solution: T | None, duration: int
+    my_solution: T, actual_solution: T | None, durations: Durations
 ) -> Iterator[str]:
     yield from solution_lines(my_solution, actual_solution)
     yield ""
-    yield from duration_lines(duration)
+    yield from duration_lines(durations)
 
 
 table = Table(style_table=Colored(C.blue.dark))
 
 
-# @raises(FileNotFoundError, NoSolutionFoundError)
-def solve(puzzle_data: PuzzleData) -> bool:
-    problem_cls = load_problem(puzzle_data)
-    problem, dur_init = timed(problem_cls)
-    sol_actual = problem.actual_solution
-    sol_mine, dur_solution = timed(problem.solution)
-    if sol_mine is None:
-        return sol_actual is None
-
-    mine = sol_mine.strip() if isinstance(sol_mine, str) else sol_mine
-    actual = sol_actual.strip() if isinstance(sol_actual, str) else sol_actual
-    # TODO: Might be interesting to show input loading time separately.
-    duration = dur_init + dur_solution
-
-    table_rows = ([line] for line in output_lines(mine, actual, duration))
+def show_outcome(outcome: Outcome) -> bool:
+    if outcome.my_solution is None:
+        return outcome.actual_solution is None
+
+    mine, actual = outcome.my_solution, outcome.actual_solution
+    table_rows = ([line] for line in output_lines(mine, actual, outcome.durations))
     log.info(table(*table_rows))
 
     return mine == actual
 
 
+# @raises(FileNotFoundError, NoSolutionFoundError)
+def solve_each(puzzles: Iterable[PuzzleData]) -> tuple[list[Outcome], bool]:
+    """Solve the part(s) of a puzzle one after the other, sharing their input."""
+    outcomes, success = [], True
+    for puzzle_data in puzzles:
+        outcome = run_puzzle(puzzle_data)
+        outcomes.append(outcome)
+        success &= show_outcome(outcome)
+    return outcomes, success
+
+
+def solve(puzzles: Iterable[PuzzleData], *, report: Path = None) -> bool:
+    outcomes, success = solve_each(puzzles)
+    if report:
+        write_report(report_entries(outcomes), report)
+    return success
+
+
+def outcome_status(outcome: Outcome) -> str:
+    if outcome.error:
+        return "💥"
+    if not outcome.is_verified:
+        return "👾"
+    return OK if outcome.is_correct else FAIL
+
+
+def batch_table_rows(outcomes: Iterable[Outcome]) -> Iterator[list[object]]:
+    yield ["Year", "Day", "Part", "", *phases(Durations()), "Total"]
+    for o in outcomes:
+        d = o.puzzle_data
+        row: list[object] = [d.year, f"{d.day:02d}", d.part, outcome_status(o)]
+        if o.error:
+            yield [*row, o.error]
+            continue
+        durations = phases(o.durations).values()
+        total = duration_with_emoji(o.duration)
+        yield [*row, *(human_readable_duration(d) for d in durations), total]
+
+
+def summary_lines(outcomes: list[Outcome]) -> Iterator[str]:
+    counts = {
+        OK: sum(o.is_correct for o in outcomes),
+        FAIL: sum(o.is_wrong for o in outcomes),
+        "👾": sum(not o.is_verified and not o.error for o in outcomes),
+        "💥": sum(bool(o.error) for o in outcomes),
+    }
+    yield "  ".join(f"{status} {n}" for status, n in counts.items())
+    total_duration = duration_with_emoji(sum(o.duration for o in outcomes))
+    yield f"Solved {len(outcomes)} parts in {total_duration}"
+    if reused := sum(o.reused for o in outcomes):
+        yield f"({reused} of them unchanged: answers & durations of a previous run)"
+
+
+def solve_all(
+    puzzles: Iterable[PuzzleData],
+    *,
+    jobs: int = 1,
+    rerun: bool = False,
+    report: Path = None,
+) -> bool:
+    outcomes = run_all(puzzles, jobs=jobs, rerun=rerun)
+    if report:
+        write_report(report_entries(outcomes), report)
+    log.info(table(*batch_table_rows(outcomes)))
+    log.info(summary_lines(outcomes))
+    return not any(o.error or o.is_wrong for o in outcomes)
+
+
+def human_readable_size(n_bytes: int) -> str:
+    size = float(n_bytes)
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def benchmark_status(benchmark: Benchmark) -> str:
+    if benchmark.error:
+        return "💥"
+    if benchmark.correct is None:
+        return "👾"
+    return OK if benchmark.correct else FAIL
+
+
+def bench_table_rows(comparisons: Iterable[Comparison]) -> Iterator[list[object]]:
+    yield [
+        *["Year", "Day", "Part", ""],
+        *["Min", "Median", "P95", "Memory", "Baseline", "Change"],
+    ]
+    for c in comparisons:
+        b = c.benchmark
+        d = b.puzzle_data
+        row: list[object] = [d.year, f"{d.day:02d}", d.part, benchmark_status(b)]
+        if b.error:
+            yield [*row, b.error]
+            continue
+        change = "-"
+        if c.baseline and (ratio := c.ratio):
+            change = f"{ratio - 1:+.1%}{' 🐌' if c.is_regression else ''}"
+        yield [
+            *row,
+            *[human_readable_duration(t) for t in (b.min, b.median, b.p95)],
+            human_readable_size(b.peak_memory),
+            c.baseline.commit if c.baseline else "-",
+            change,
+        ]
+
+
+def bench(
+    puzzles: Iterable[PuzzleData],
+    *,
+    runs: int,
+    warmup: int,
+    threshold: float,
+    baseline: str = None,
+) -> bool:
+    # Only needed for benchmarking (and pulls in tracemalloc & statistics).
+    from .bench import bench_all  # noqa: PLC0415
+
+    comparisons = bench_all(
+        puzzles, runs=runs, warmup=warmup, threshold=threshold, baseline_commit=baseline
+    )
+    log.info(table(*bench_table_rows(comparisons)))
+    regressions = sum(c.is_regression for c in comparisons)
+    log.info(f"{regressions} regression(s): median more than {threshold:.0%} slower")
+    return not regressions and all(
+        c.benchmark.correct is not False for c in comparisons
+    )
+
+
+def import_profile(puzzles: Iterable[PuzzleData], *, limit: int = 25) -> bool:
+    """Show where the time goes when importing the CLI and the puzzle(s)."""
+    from .imports import profile_imports, time_per_group  # noqa: PLC0415
+
+    modules = dict.fromkeys([f"{PKG_NAME}.cli", *(p.module_name for p in puzzles)])
+    times = profile_imports(modules)
+    total = sum(t.own for t in times)
+    groups = list(time_per_group(times).items())
+    table_rows: list[list[object]] = [["Module / package", "Import time", "Share"]]
+    for group, duration in groups[:limit]:
+        table_rows.append(
+            [group, human_readable_duration(duration), f"{duration / total:.1%}"]
+        )
+    log.info(table(*table_rows))
+    log.info(
+        f"Imported {len(times)} modules ({len(groups)} packages) "
+        f"in {human_readable_duration(total)}"
+    )
+    return True
+
+
 def _parse_args() -> Namespace:
     today = datetime.now(UTC).date()
     y, m, d = today.year, today.month, today.day
@@ -118,34 +296,162 @@ def _parse_args() -> Namespace:
 
     parser = ArgumentParser()
     parser.add_argument(
-        "--year",
-        dest="year",
-        type=int,
-        default=year,
-        choices=[2019, *range(2021, year + 1)],
+        "--year", dest="year", type=int, choices=[2019, *range(2021, year + 1)]
     )
+    parser.add_argument("--day", dest="day", type=int, choices=days)
     parser.add_argument(
-        "--day",
-        dest="day",
+        "--part",
+        dest="parts",
         type=int,
-        default=day,
-        choices=days,
-        required=not is_aoc_day,
+        nargs="+",
+        choices=[1, 2],
+        help="part(s) to solve: --part 1 2 solves both, sharing their (processed) input",
+    )
+    parser.add_argument(
+        "-a",
+        "--all",
+        dest="all",
+        action="store_true",
+        help="solve all puzzles (matching --year/--day/--part) in one go",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=check_integer_in_range(1, None),
+        default=1,
+        help="number of worker processes to spread the puzzles over (with --all)",
+    )
+    parser.add_argument(
+        "--rerun",
+        dest="rerun",
+        action="store_true",
+        help="solve all puzzles again, also the unchanged ones (with --all)",
+    )
+    parser.add_argument(
+        "-r",
+        "--report",
+        dest="report",
+        type=Path,
+        help="write outcomes & durations (per phase) to this JSON file",
+    )
+    parser.add_argument(
+        "-b",
+        "--bench",
+        dest="bench",
+        action="store_true",
+        help="benchmark the puzzle(s) and compare against previous benchmarks",
+    )
+    parser.add_argument(
+        "--runs",
+        dest="runs",
+        type=check_integer_in_range(1, None),
+        default=5,
+        help="number of timed runs per puzzle (with --bench)",
+    )
+    parser.add_argument(
+        "--warmup",
+        dest="warmup",
+        type=check_integer_in_range(0, None),
+        default=1,
+        help="number of untimed runs per puzzle before the timed ones (with --bench)",
+    )
+    parser.add_argument(
+        "--threshold",
+        dest="threshold",
+        type=check_integer_in_range(0, None),
+        default=10,
+        help="percentage a median may get slower before it counts as regression",
+    )
+    parser.add_argument(
+        "--baseline",
+        dest="baseline",
+        help="commit to compare against (default: most recent other commit)",
+    )
+    parser.add_argument(
+        "--import-profile",
+        dest="import_profile",
+        action="store_true",
+        help="show how long it takes to import the modules needed for the puzzle(s)",
+    )
+    parser.add_argument(
+        "--serve",
+        dest="serve",
+        action="store_true",
+        help="keep running, to solve the puzzles asked for with --connect",
+    )
+    parser.add_argument(
+        "-c",
+        "--connect",
+        dest="connect",
+        action="store_true",
+        help="let the running server (see --serve) solve the puzzle(s)",
     )
-    parser.add_argument("--part", dest="part", type=int, choices=[1, 2], required=True)
     parser.add_argument("-t", "--test", dest="test", action="store_true")
     parser.add_argument("-d", "--debug", dest="debugging", action="store_true")
     parser.add_argument("-n", "--no-input", dest="no_input", action="store_true")
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    if args.connect and (args.all or args.bench or args.import_profile):
+        parser.error("argument --connect: only for solving separate puzzles")
+    if args.jobs != 1 and not args.all:
+        parser.error("argument -j/--jobs: only for solving all puzzles (with --all)")
+    if not args.all and not args.serve:
+        if args.day is None and not is_aoc_day:
+            parser.error("the following arguments are required: --day")
+        if args.parts is None:
+            parser.error("the following arguments are required: --part")
+        args.year = args.year or year
+        args.day = args.day or day
+
+    return args
 
 
-@killed_by_errors(FileNotFoundError, ModuleNotFoundError, NoSolutionFoundError)
+@killed_by_errors(
+    FileNotFoundError, ModuleNotFoundError, NoSolutionFoundError, ConnectionError
+)
 def main() -> None:
     args = _parse_args()
+    if args.serve:
+        # Only the server needs it (and it needs the rest of this module).
+        from .server import serve  # noqa: PLC0415
+
+        with log.context(LogLevel.INFO):
+            serve()
+        return
+
     input_mode: InputMode = (
         "none" if args.no_input else "test" if args.test else "puzzle"
     )
-    puzzle_data = PuzzleData(args.year, args.day, args.part, input_mode)
+    parts = args.parts or [1, 2]
+    puzzles = (
+        [
+            puzzle
+            for puzzle in find_puzzles(input_mode, year=args.year, day=args.day)
+            if puzzle.part in parts
+        ]
+        if args.all
+        else [PuzzleData(args.year, args.day, part, input_mode) for part in parts]
+    )
     with log.context(LogLevel.DEBUG if args.debugging else LogLevel.INFO):
-        success = solve(puzzle_data)
+        if args.import_profile:
+            success = import_profile(puzzles)
+        elif args.bench:
+            success = bench(
+                puzzles,
+                runs=args.runs,
+                warmup=args.warmup,
+                threshold=args.threshold / 100,
+                baseline=args.baseline,
+            )
+        elif args.connect:
+            from .server import request_solve  # noqa: PLC0415
+
+            success = request_solve(puzzles, debug=args.debugging, report=args.report)
+        elif args.all:
+            success = solve_all(
+                puzzles, jobs=args.jobs, rerun=args.rerun, report=args.report
+            )
+        else:
+            success = solve(puzzles, report=args.report)
     sys.exit(not success)
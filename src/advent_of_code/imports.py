@@ -0,0 +1,150 @@
+"""
+What the modules of the puzzles import.
+
+That's where the time goes when starting up: imports are timed in a fresh
+interpreter (python -X importtime), as only the first import of a module does the
+actual work. It's also what a puzzle depends on: when none of the modules it
+(indirectly) imports has changed, neither has its solution.
+"""
+
+import ast
+import hashlib
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cache
+from importlib.util import resolve_name
+from typing import TYPE_CHECKING
+
+from .problems import PKG_DIR, PKG_NAME
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    # Time spent in the module itself, and including the imports it triggered (ns).
+    own: int
+    cumulative: int
+
+    @property
+    def group(self) -> str:
+        """
+        Package the module is accounted to.
+
+        That's its top-level package, or the module itself for modules of this package.
+
+        >>> [ImportTime(m, 1, 1).group for m in ("kleur.color", "advent_of_code.cli")]
+        ['kleur', 'advent_of_code.cli']
+        """
+        top, *_ = self.module.split(".")
+        return self.module if top == PKG_NAME else top
+
+
+def profile_imports(modules: Iterable[str]) -> list[ImportTime]:
+    """Time the imports (and everything they import) in a fresh interpreter."""
+    code = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run(  # noqa: S603 (only our own module names)
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, module = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            # Reported in µs
+            times.append(
+                ImportTime(module.strip(), int(own) * 1000, int(cumulative) * 1000)
+            )
+    return times
+
+
+def time_per_group(times: Iterable[ImportTime]) -> dict[str, int]:
+    """Total import time per package (in ns), slowest first."""
+    totals: defaultdict[str, int] = defaultdict(int)
+    for t in times:
+        totals[t.group] += t.own
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def module_path(module: str) -> Path | None:
+    """
+    Source file of a module of this package (or None for any other module).
+
+    >>> [module_path(m) is not None for m in ("advent_of_code.utils", "kleur")]
+    [True, False]
+    """
+    top, *rest = module.split(".")
+    if top != PKG_NAME:
+        return None
+    path = PKG_DIR.joinpath(*rest)
+    for source in path / "__init__.py", path.with_name(f"{path.name}.py"):
+        if source.is_file():
+            return source
+    return None
+
+
+def imported_modules(module: str) -> Iterator[str]:
+    """
+    Modules of this package that a module of it imports directly.
+
+    That includes the imports inside functions (which are only done when needed),
+    and the packages the imported modules are part of.
+    """
+    path = module_path(module)
+    if not path:
+        return
+    package = module if path.name == "__init__.py" else module.rpartition(".")[0]
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = resolve_name("." * node.level + (node.module or ""), package)
+            # Imported names could be modules as well.
+            names = [base, *(f"{base}.{alias.name}" for alias in node.names)]
+        else:
+            continue
+        for name in names:
+            parts = name.split(".")
+            for n in range(1, len(parts) + 1):
+                if module_path(imported := ".".join(parts[:n])):
+                    yield imported
+
+
+def dependencies(module: str) -> set[str]:
+    """
+    Modules of this package a module needs: itself, and what it (indirectly) imports.
+
+    >>> deps = dependencies("advent_of_code.year2019.day09")
+    >>> sorted(m for m in deps if m.startswith("advent_of_code.year"))
+    ['advent_of_code.year2019', 'advent_of_code.year2019.day09', 'advent_of_code.year2019.intcode']
+    >>> "advent_of_code.problems" in deps, "advent_of_code.utils.cycles" in deps
+    (True, False)
+    """
+    parts = module.split(".")
+    found: set[str] = set()
+    todo = [".".join(parts[:n]) for n in range(1, len(parts) + 1)]
+    while todo:
+        if (m := todo.pop()) not in found:
+            found.add(m)
+            todo.extend(imported_modules(m))
+    return {m for m in found if module_path(m)}
+
+
+@cache
+def dependency_digest(module: str) -> str:
+    """Hash of the source code of a module and everything it depends on."""
+    h = hashlib.blake2b(digest_size=8)
+    for m in sorted(dependencies(module)):
+        if path := module_path(m):
+            h.update(m.encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
@@ -1,13 +1,13 @@
 from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from functools import cached_property
 from logging import Formatter, LogRecord
 from pprint import pformat
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TextIO
 
 from based_utils.cli import ConsoleHandlers, LogLevel, LogMeister, term_size
 from based_utils.data import consume
 from kleur import GREY, Colored, Colors
-from ternimator import animate_iter
 
 if TYPE_CHECKING:
     from ternimator import AnimParams
@@ -63,6 +63,19 @@ class AppLogger(LogMeister):
 
         return stdout_handler, stderr_handler
 
+    @contextmanager
+    def redirected(self, stdout: TextIO, stderr: TextIO) -> Iterator[None]:
+        """Log to other streams than the console, for the time being."""
+        handlers = self._console_handlers
+        console_streams = [handler.stream for handler in handlers]
+        for handler, stream in zip(handlers, [stdout, stderr], strict=True):
+            handler.setStream(stream)
+        try:
+            yield
+        finally:
+            for handler, stream in zip(handlers, console_streams, strict=True):
+                handler.setStream(stream)
+
     def debug(self, msg: object) -> None:
         self._main_logger.debug(msg)
 
@@ -79,7 +92,8 @@ class AppLogger(LogMeister):
         self._main_logger.fatal(msg)
 
     def lazy_debug(self, cb: Callable[[], object]) -> None:
-        self._main_logger.debug(cb())
+        if self._main_logger.level == LogLevel.DEBUG:
+            self._main_logger.debug(cb())
 
     def lazy_info(self, cb: Callable[[], object]) -> None:
         self._main_logger.info(cb())
@@ -90,11 +104,14 @@ class AppLogger(LogMeister):
     def debug_animated_iter[T](
         self, items: Iterator[T], params: AnimParams = None
     ) -> Iterator[T]:
-        yield from (
-            animate_iter(items, params)
-            if self._main_logger.level == LogLevel.DEBUG
-            else items
-        )
+        if self._main_logger.level != LogLevel.DEBUG:
+            yield from items
+            return
+
+        # Only needed when debugging, and slow to import (it pulls in pynput)
+        from ternimator import animate_iter  # noqa: PLC0415
+
+        yield from animate_iter(items, params)
 
     def debug_animated[T](self, items: Iterator[T], params: AnimParams = None) -> None:
         consume(self.debug_animated_iter(items, params))
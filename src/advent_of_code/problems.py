@@ -1,20 +1,34 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
 import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cache, cached_property
 from importlib import import_module
 from pathlib import Path
-from typing import ClassVar, Literal, Self
+from typing import TYPE_CHECKING, ClassVar, Literal, Self, overload
 
+from based_utils.cli import timed
 from gaffe import raises
 from more_itertools import strip
-from parse import findall  # type: ignore[import-untyped]
+from parse import Parser  # type: ignore[import-untyped]
+from parse import compile as compile_pattern
 
 import advent_of_code
 
-from .utils.geo2d import BitGrid2, CharGrid2, Grid2, NumGrid2
-from .utils.geo3d import P3D
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from .utils.geo2d import BitGrid2, CharGrid2, Grid2, NumGrid2
 
 PKG_NAME = advent_of_code.__name__
+PKG_DIR = Path(advent_of_code.__file__).parent
+
+CACHE_DIR = Path(".cache")
+INPUT_CACHE_DIR = CACHE_DIR / "inputs"
 
 
 class NoSolutionFoundError(Exception):
@@ -32,6 +46,103 @@ class PuzzleData:
     part: int
     input_mode: InputMode
 
+    @property
+    def key(self) -> str:
+        return f"{self.year}/{self.day:02d}/{self.part}/{self.input_mode}"
+
+    @property
+    def input_path(self) -> Path:
+        return Path("input") / f"{self.year}" / f"{self.day:02d}.txt"
+
+    @property
+    def module_name(self) -> str:
+        return f"{PKG_NAME}.year{self.year}.day{self.day:02d}"
+
+    @property
+    def session(self) -> Session:
+        key = self.year, self.day, self.input_mode
+        if key not in _sessions:
+            # Only the session of the most recent puzzle is kept.
+            _sessions.clear()
+            _sessions[key] = Session()
+        return _sessions[key]
+
+
+@dataclass
+class Session:
+    """
+    What the parts of a puzzle share, when solved one after the other.
+
+    That's the input (read only once) and values derived from it: the ones marked
+    as shared_property in the problem classes.
+    """
+
+    inputs: dict[str, str] = field(default_factory=dict)
+    values: dict[tuple[str, str], object] = field(default_factory=dict)
+
+
+_sessions: dict[tuple[int, int, InputMode], Session] = {}
+
+
+def end_sessions() -> None:
+    """Forget everything shared so far, so the next puzzle starts from scratch."""
+    _sessions.clear()
+
+
+def forget_sources() -> None:
+    """Forget what was derived from the source code, when it could have changed."""
+    from .imports import dependency_digest  # noqa: PLC0415 (imports this module)
+
+    end_sessions()
+    dependency_digest.cache_clear()
+    _compile_pattern.cache_clear()
+
+
+# Processed input is cached on disk as pickled values (protocol 5), with the buffers
+# of arrays stored separately (out-of-band). Loading maps the file into memory, so
+# these buffers are used as they are: arrays aren't even copied.
+
+_ALIGNMENT = 64
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _write_cached(path: Path, value: object) -> None:
+    buffers: list[pickle.PickleBuffer] = []
+    blobs: list[bytes | memoryview] = [
+        pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    ]
+    blobs += [buffer.raw() for buffer in buffers]
+    header = struct.pack(f"<{len(blobs) + 1}Q", len(blobs), *map(len, blobs))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written under a temporary name first, as parallel runs could read it already.
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}")
+    with temp_path.open("wb") as f:
+        for blob in header, *blobs:
+            f.write(blob)
+            f.write(bytes(-f.tell() % _ALIGNMENT))
+    temp_path.replace(path)
+    # Left behind by older versions of the source (for the same input).
+    name, _source_digest, input_digest = path.stem.rsplit("-", 2)
+    for stale_path in path.parent.glob(f"{name}-*-{input_digest}.pickle"):
+        if stale_path != path:
+            stale_path.unlink(missing_ok=True)
+
+
+def _read_cached(path: Path) -> object:
+    with path.open("rb") as f:
+        # Copy on write: the values can be changed, without changing the file.
+        mapped = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+    (count,) = struct.unpack_from("<Q", mapped)
+    offset, blobs = 0, []
+    for size in (8 * (count + 1), *struct.unpack_from(f"<{count}Q", mapped, 8)):
+        blobs.append(mapped[offset : offset + size])
+        offset += size + -size % _ALIGNMENT
+    _header, data, *buffers = blobs
+    return pickle.loads(data, buffers=buffers)  # noqa: S301 (written by ourselves)
+
 
 class Problem[T](ABC):
     test_solution: T | None = None
@@ -43,8 +154,21 @@ class Problem[T](ABC):
     is_test_run: bool = False
     has_no_input: bool = False
 
+    # Work in progress: left out when finding all puzzles to solve.
+    is_unfinished: ClassVar[bool] = False
+
+    # Time (in ns) it took to read the input and to process it.
+    read_duration: int = 0
+    parse_duration: int = 0
+
     data: ClassVar[PuzzleData]
 
+    # Whether to keep the processed input (and the shared values) on disk, to load
+    # on later runs instead of processing the input again. Worth it for puzzles with
+    # a lot of parsing to do. The cached values are only used for the very same input
+    # and source code of the puzzle.
+    cache_input: ClassVar[bool] = False
+
     def __new__(cls) -> Self:
         # Read input into problem instance before its actual __init__() will be called.
         self: Self = super().__new__(cls)
@@ -57,26 +181,55 @@ class Problem[T](ABC):
 
     @raises(FileNotFoundError)
     def _load_input(self) -> None:
-        if self.is_test_run:
-            self._load_test_input()
-        else:
-            self._load_puzzle_input()
+        read_input = (
+            self._read_test_input if self.is_test_run else self._read_puzzle_input
+        )
+        input_, self.read_duration = timed(read_input)
+        self._set_input(input_)
 
-    def _load_test_input(self) -> None:
+    def _read_test_input(self) -> str:
         module, v = sys.modules[self.__module__], "TEST_INPUT"
         v_part = f"{v}_{self.data.part}"
-        self._set_input(getattr(module, v_part if (v_part in dir(module)) else v))
+        test_input: str = getattr(module, v_part if (v_part in dir(module)) else v)
+        return test_input
 
-    def _load_puzzle_input(self) -> None:
-        path = Path("input") / f"{self.data.year}" / f"{self.data.day:02d}.txt"
-        with path.open(encoding="utf8") as input_file:
-            self._set_input(input_file.read())
+    def _read_puzzle_input(self) -> str:
+        inputs = self.data.session.inputs
+        if "puzzle" not in inputs:
+            with self.data.input_path.open(encoding="utf8") as input_file:
+                inputs["puzzle"] = input_file.read()
+        return inputs["puzzle"]
 
     def _set_input(self, input_: str) -> None:
         self.input = input_
         self.corrected_input = input_.lstrip("\n").rstrip() + "\n"
         self.line_count = self.corrected_input.count("\n")
-        self.process_input()
+        process = self._process_cached_input if self.cache_input else self.process_input
+        _, self.parse_duration = timed(process)
+
+    def cache_path(self, name: str) -> Path:
+        """Where to cache a value derived from the input."""
+        from .imports import dependency_digest  # noqa: PLC0415 (imports this module)
+
+        # The source of the puzzle module, and of all modules it (indirectly) imports:
+        # the cached values are instances of the classes defined there.
+        source_digest = dependency_digest(self.data.module_name)
+        input_digest = _digest(self.input.encode())
+        directory = INPUT_CACHE_DIR / f"{self.data.year}" / f"{self.data.day:02d}"
+        return directory / f"{name}-{source_digest}-{input_digest}.pickle"
+
+    def _process_cached_input(self) -> None:
+        path = self.cache_path(f"part{self.data.part}")
+        try:
+            self.__dict__.update(_read_cached(path))  # type: ignore[call-overload]
+        except Exception:  # noqa: BLE001 (missing, stale, or broken: process again)
+            processed_before = set(self.__dict__)
+            self.process_input()
+            # Cached right away: the solution could still change the values.
+            _write_cached(
+                path,
+                {k: v for k, v in self.__dict__.items() if k not in processed_before},
+            )
 
     def var[V](self, *, test: V, puzzle: V) -> V:
         return test if self.is_test_run else puzzle
@@ -94,6 +247,51 @@ class Problem[T](ABC):
         pass
 
 
+class shared_property[P: Problem, V]:  # noqa: N801 (like cached_property)
+    """
+    Like cached_property, but computed only once for all parts of a puzzle.
+
+    The parts get the very same value (as long as their input is the same), so it
+    shouldn't be changed by either of them.
+    """
+
+    def __init__(self, func: Callable[[P], V]) -> None:
+        self.func = func
+        self.name = func.__name__
+
+    def __set_name__(self, owner: type[P], name: str) -> None:
+        self.name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type[P]) -> Self: ...
+
+    @overload
+    def __get__(self, instance: P, owner: type[P]) -> V: ...
+
+    def __get__(self, instance: P | None, owner: type[P]) -> Self | V:
+        if instance is None:
+            return self
+        values = instance.data.session.values
+        key = self.func.__qualname__, "" if instance.has_no_input else instance.input
+        if key not in values:
+            values[key] = self._compute(instance)
+        value: V = values[key]  # type: ignore[assignment]
+        # From now on, the instance attribute takes precedence over this descriptor.
+        instance.__dict__[self.name] = value
+        return value
+
+    def _compute(self, instance: P) -> V:
+        if not instance.cache_input or instance.has_no_input:
+            return self.func(instance)
+        path = instance.cache_path(self.func.__qualname__)
+        try:
+            value: V = _read_cached(path)  # type: ignore[assignment]
+        except Exception:  # noqa: BLE001 (missing, stale, or broken: compute again)
+            value = self.func(instance)
+            _write_cached(path, value)
+        return value
+
+
 @raises(ModuleNotFoundError)
 def load_problem[T](data: PuzzleData) -> type[Problem[T]]:
     y, d, p = f"year{data.year}", f"day{data.day:02d}", f"Problem{data.part}"
@@ -102,6 +300,24 @@ def load_problem[T](data: PuzzleData) -> type[Problem[T]]:
     return problem_cls
 
 
+def find_puzzles(
+    input_mode: InputMode, *, year: int = None, day: int = None, part: int = None
+) -> Iterator[PuzzleData]:
+    """Find all puzzle parts that have a (finished) problem, optionally filtered."""
+    y, d = f"year{year or '*'}", f"day{day:02d}" if day else "day*"
+    for path in sorted(PKG_DIR.glob(f"{y}/{d}.py")):
+        module = import_module(f".{path.parent.name}.{path.stem}", PKG_NAME)
+        year_ = int(path.parent.name.removeprefix("year"))
+        day_ = int(path.stem.removeprefix("day"))
+        for part_ in [part] if part else [1, 2]:
+            if (day_, part_) == (25, 2):
+                # Christmas day has no second puzzle, only a (looping) animation.
+                continue
+            problem_cls = getattr(module, f"Problem{part_}", None)
+            if problem_cls and not problem_cls.is_unfinished:
+                yield PuzzleData(year_, day_, part_, input_mode)
+
+
 class OneLineProblem[T](Problem[T], ABC):
     line: str
 
@@ -118,75 +334,129 @@ class MultiLineProblem[T](Problem[T], ABC):
         )
 
 
+# The grid classes are only imported when a grid is parsed: utils.geo2d (and all
+# it imports) is slow to import for the puzzles that don't need it.
+
+
 class _GridProblem[E, T](MultiLineProblem[T], ABC):
-    grid_cls: type[Grid2[E]]
     grid: Grid2[E]
 
+    @staticmethod
+    @abstractmethod
+    def grid_classes() -> tuple[type[Grid2[E]], type[Grid2[E]]]:
+        """Grid class, and the one used when the input fills up a rectangle."""
+
     @abstractmethod
     def parse_value(self, c: str) -> E:
         pass
 
     def process_input(self) -> None:
+        from .utils.geo2d import is_dense  # noqa: PLC0415
+
         super().process_input()
-        self.grid = self.grid_cls.from_lines(self.lines, parse_value=self.parse_value)
+        grid_cls, dense_grid_cls = self.grid_classes()
+        grid_cls = dense_grid_cls if is_dense(self.lines) else grid_cls
+        self.grid = grid_cls.from_lines(self.lines, parse_value=self.parse_value)
 
 
 class CharGridProblem[T](_GridProblem[str, T], ABC):
-    grid_cls = CharGrid2
     grid: CharGrid2
 
+    @staticmethod
+    def grid_classes() -> tuple[type[CharGrid2], type[CharGrid2]]:
+        from .utils.geo2d import CharGrid2, DenseCharGrid2  # noqa: PLC0415
+
+        return CharGrid2, DenseCharGrid2
+
     def parse_value(self, c: str) -> str:
         return c
 
 
 class NumGridProblem[T](_GridProblem[int, T], ABC):
-    grid_cls = NumGrid2
     grid: NumGrid2
 
+    @staticmethod
+    def grid_classes() -> tuple[type[NumGrid2], type[NumGrid2]]:
+        from .utils.geo2d import DenseNumGrid2, NumGrid2  # noqa: PLC0415
+
+        return NumGrid2, DenseNumGrid2
+
     def parse_value(self, c: str) -> int:
         return int(c)
 
 
 class BitGridProblem[T](_GridProblem[bool, T], ABC):
-    grid_cls = BitGrid2
     grid: BitGrid2
 
+    @staticmethod
+    def grid_classes() -> tuple[type[BitGrid2], type[BitGrid2]]:
+        from .utils.geo2d import BitGrid2, DenseBitGrid2  # noqa: PLC0415
+
+        return BitGrid2, DenseBitGrid2
+
     def parse_value(self, c: str) -> bool:
         return c != "."
 
 
+@cache
+def _compile_pattern(pattern: str, module_name: str) -> Parser:
+    """
+    Compile a pattern to parse the input of a puzzle with.
+
+    Besides the built-in types, patterns can use the ones defined by __parse_<type>
+    functions in the module of the puzzle (and p3 for 3D points).
+    """
+    from .utils.geo3d import P3D  # noqa: PLC0415 (only needed here)
+
+    prefix = "__parse_"
+    module = sys.modules[module_name]
+    extra_types = {
+        f[len(prefix) :]: getattr(module, f)
+        for f in dir(module)
+        if f.startswith(prefix)
+    } | {"p3": P3D.from_str}
+    return compile_pattern(pattern, extra_types=extra_types)
+
+
 class ParsedProblem[R, T](Problem[T], ABC):
     line_pattern: str = ""
     multi_line_pattern: str = ""
+    # Only parsed as iter_parsed (or parsed_input) is used: counts as init time then.
+    stream_input: ClassVar[bool] = False
     # _regex_pattern: str | None
     # _regex_converters: list[Callable[[str], Any]] | None
 
-    parsed_input: list[R]
     # parsed_regex: list[list]
 
+    @property
+    def _parser(self) -> Parser:
+        # Compiled only once per day, the parts share the same pattern.
+        return _compile_pattern(
+            self.multi_line_pattern or self.line_pattern + "\n", self.__module__
+        )
+
     def process_input(self) -> None:
         if not self.line_pattern and not self.multi_line_pattern:
             msg = "Either line_pattern or multi_line_pattern should be set."
             raise TypeError(msg)
-        prefix = "__parse_"
-        module = sys.modules[self.__module__]
-        extra_types = {
-            f[len(prefix) :]: getattr(module, f)
-            for f in dir(module)
-            if f.startswith(prefix)
-        } | {"p3": P3D.from_str}
-
-        self.parsed_input = [
-            r.fixed
-            for r in findall(
-                self.multi_line_pattern or self.line_pattern + "\n",
-                self.corrected_input,
-                extra_types=extra_types,
-            )
-        ]
+        if self.cache_input or not self.stream_input:
+            # Parsed right away: timed as parsing, and ends up in the cache.
+            self.__dict__["parsed_input"] = list(self.iter_parsed())
         # elif self._regex_pattern:
         #     rc = self._regex_converters or []
         #     self.parsed_regex = [
         #         [(rc[n](g) if n < len(rc) else g) for n, g in enumerate(groups)]
         #         for groups in re.findall(self._regex_pattern, self.corrected_input)
         #     ]
+
+    def iter_parsed(self) -> Iterator[R]:
+        """Go over the parsed input, parsed one record at a time if streamed."""
+        if "parsed_input" in self.__dict__:
+            yield from self.parsed_input
+            return
+        for r in self._parser.findall(self.corrected_input):
+            yield r.fixed
+
+    @cached_property
+    def parsed_input(self) -> list[R]:
+        return list(self.iter_parsed())
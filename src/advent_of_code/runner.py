@@ -0,0 +1,249 @@
+import hashlib
+import json
+import sys
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from based_utils.cli import timed
+
+from .imports import dependency_digest
+from .problems import CACHE_DIR, PKG_NAME, PuzzleData, end_sessions, load_problem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from pathlib import Path
+
+DURATIONS_FILE = CACHE_DIR / "durations.json"
+RESULTS_FILE = CACHE_DIR / "results.json"
+
+
+@dataclass(frozen=True)
+class Durations:
+    """Time (in ns) spent in the different phases of solving a puzzle."""
+
+    read_input: int = 0
+    parse_input: int = 0
+    init: int = 0
+    solution: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.read_input + self.parse_input + self.init + self.solution
+
+
+@dataclass(frozen=True)
+class Outcome[T]:
+    puzzle_data: PuzzleData
+    my_solution: T | None = None
+    actual_solution: T | None = None
+    durations: Durations = Durations()
+    error: str | None = None
+    # Taken from a previous run, as nothing the puzzle depends on has changed since.
+    reused: bool = False
+
+    @property
+    def duration(self) -> int:
+        return self.durations.total
+
+    @property
+    def is_verified(self) -> bool:
+        return self.error is None and self.actual_solution is not None
+
+    @property
+    def is_correct(self) -> bool:
+        return self.is_verified and self.my_solution == self.actual_solution
+
+    @property
+    def is_wrong(self) -> bool:
+        return self.is_verified and self.my_solution != self.actual_solution
+
+
+# @raises(FileNotFoundError, NoSolutionFoundError)
+def run_puzzle(puzzle_data: PuzzleData, *, fresh: bool = False) -> Outcome:
+    """
+    Solve a puzzle, reusing what a previous part of the same puzzle shared.
+
+    Unless the run should be fresh: then everything is done from scratch.
+    """
+    if fresh:
+        end_sessions()
+    problem_cls = load_problem(puzzle_data)
+    problem, dur_new = timed(problem_cls)
+    sol_actual = problem.actual_solution
+    sol_mine, dur_solution = timed(problem.solution)
+
+    mine = sol_mine.strip() if isinstance(sol_mine, str) else sol_mine
+    actual = sol_actual.strip() if isinstance(sol_actual, str) else sol_actual
+    # Creating the problem reads & processes its input before calling __init__().
+    dur_read, dur_parse = problem.read_duration, problem.parse_duration
+    dur_init = dur_new - dur_read - dur_parse
+    durations = Durations(dur_read, dur_parse, dur_init, dur_solution)
+
+    return Outcome(puzzle_data, mine, actual, durations)
+
+
+def try_run_puzzle(puzzle_data: PuzzleData, *, fresh: bool = False) -> Outcome:
+    try:
+        return run_puzzle(puzzle_data, fresh=fresh)
+    except Exception as exc:  # noqa: BLE001
+        # One broken puzzle shouldn't take down the whole batch.
+        return Outcome(puzzle_data, error=type(exc).__name__)
+
+
+def _load_json[T](path: Path) -> dict[str, T]:
+    try:
+        with path.open(encoding="utf8") as f:
+            data: dict[str, T] = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return data
+
+
+def _save_json(data: Mapping[str, object], path: Path) -> None:
+    CACHE_DIR.mkdir(exist_ok=True)
+    with path.open("w", encoding="utf8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_durations() -> dict[str, int]:
+    return _load_json(DURATIONS_FILE)
+
+
+def save_durations(outcomes: Iterable[Outcome]) -> None:
+    durations = load_durations() | {
+        o.puzzle_data.key: o.duration for o in outcomes if not o.error
+    }
+    _save_json(durations, DURATIONS_FILE)
+
+
+def result_digest(puzzle_data: PuzzleData) -> str | None:
+    """
+    Hash of everything the outcome of a puzzle depends on: its code and its input.
+
+    The code is that of its module and of all modules of this package it imports
+    (directly or not). None if the input can't be read.
+    """
+    h = hashlib.blake2b(dependency_digest(puzzle_data.module_name).encode())
+    if puzzle_data.input_mode == "puzzle":
+        try:
+            h.update(puzzle_data.input_path.read_bytes())
+        except OSError:
+            return None
+    return h.hexdigest()[:16]
+
+
+def reused_outcomes(
+    puzzles: Iterable[PuzzleData], digests: dict[str, str | None]
+) -> dict[str, Outcome]:
+    """Outcomes of previous runs, for the puzzles that haven't changed since."""
+    results: dict[str, dict] = _load_json(RESULTS_FILE)
+    outcomes = {}
+    for puzzle_data in puzzles:
+        key = puzzle_data.key
+        result = results.get(key)
+        if not result or not digests[key] or result["digest"] != digests[key]:
+            continue
+        outcomes[key] = Outcome(
+            puzzle_data,
+            result["my_solution"],
+            result["actual_solution"],
+            Durations(**result["durations"]),
+            reused=True,
+        )
+    return outcomes
+
+
+def save_results(outcomes: Iterable[Outcome], digests: dict[str, str | None]) -> None:
+    """Record the answers (and durations) of the puzzles that were actually solved."""
+    results: dict[str, dict] = _load_json(RESULTS_FILE)
+    for o in outcomes:
+        key, mine = o.puzzle_data.key, o.my_solution
+        # Only answers that survive a round trip through JSON as they are.
+        if o.error or not digests[key] or not isinstance(mine, int | str):
+            continue
+        results[key] = {
+            "digest": digests[key],
+            "my_solution": mine,
+            "actual_solution": o.actual_solution,
+            "durations": asdict(o.durations),
+        }
+    _save_json(results, RESULTS_FILE)
+
+
+def longest_first(puzzles: list[PuzzleData]) -> list[int]:
+    """
+    Order in which to schedule the puzzles, slowest first.
+
+    Durations are taken from previous runs. Puzzles that haven't been timed before
+    could be anything, so they are scheduled before all others.
+    """
+    durations = load_durations()
+
+    def expected_duration(i: int) -> int:
+        return durations.get(puzzles[i].key, sys.maxsize)
+
+    return sorted(range(len(puzzles)), key=expected_duration, reverse=True)
+
+
+def _import_solutions(modules: Iterable[str]) -> None:
+    for module in modules:
+        import_module(module, PKG_NAME)
+
+
+def _run_parallel(puzzles: list[PuzzleData], jobs: int) -> list[Outcome]:
+    # Pulls in multiprocessing, which is only needed here.
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    schedule = longest_first(puzzles)
+    modules = {f".year{p.year}.day{p.day:02d}" for p in puzzles}
+    with ProcessPoolExecutor(
+        jobs, initializer=_import_solutions, initargs=(modules,)
+    ) as pool:
+        # Jobs are picked up in order of submission.
+        scheduled_outcomes = pool.map(try_run_puzzle, [puzzles[i] for i in schedule])
+        outcomes = dict(zip(schedule, scheduled_outcomes, strict=True))
+    # Merge back into the original (year, day, part) order.
+    return [outcomes[i] for i in range(len(puzzles))]
+
+
+def report_entries(outcomes: Iterable[Outcome]) -> list[dict[str, object]]:
+    """Describe the outcomes (including durations per phase) for a report."""
+    return [
+        asdict(o.puzzle_data)
+        | {
+            "correct": o.is_correct if o.is_verified else None,
+            "error": o.error,
+            "reused": o.reused,
+            "durations": asdict(o.durations) | {"total": o.duration},
+        }
+        for o in outcomes
+    ]
+
+
+def write_report(entries: list[dict[str, object]], path: Path) -> None:
+    with path.open("w", encoding="utf8") as f:
+        json.dump(entries, f, indent=2)
+
+
+def run_all(
+    puzzles: Iterable[PuzzleData], *, jobs: int = 1, rerun: bool = False
+) -> list[Outcome]:
+    """
+    Solve all puzzles, or rather: the ones that changed since they were last solved.
+
+    For the others, the outcome of the previous run is reused. Unless all of them
+    should be solved again.
+    """
+    puzzle_list = list(puzzles)
+    digests = {p.key: result_digest(p) for p in puzzle_list}
+    reused = {} if rerun else reused_outcomes(puzzle_list, digests)
+    to_solve = [p for p in puzzle_list if p.key not in reused]
+    if jobs > 1:
+        solved = _run_parallel(to_solve, jobs)
+    else:
+        solved = [try_run_puzzle(puzzle_data) for puzzle_data in to_solve]
+    save_durations(solved)
+    save_results(solved, digests)
+    outcomes = reused | {o.puzzle_data.key: o for o in solved}
+    return [outcomes[p.key] for p in puzzle_list]
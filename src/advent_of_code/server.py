@@ -0,0 +1,153 @@
+"""
+A warm solver: a process that keeps running, to solve puzzles on request.
+
+The modules the puzzles share are imported up front, and the module of a puzzle is
+kept once it's imported, so solving it again takes little more than the solving.
+Requests come in over a Unix socket (from aoc_solve --connect), one at a time.
+
+A puzzle module that changed since it was imported is reloaded before solving. That
+doesn't go for the modules it imports: after changing those, restart the server.
+"""
+
+import json
+import pkgutil
+import socket
+import sys
+import traceback
+from dataclasses import asdict
+from functools import partial
+from importlib import import_module, reload
+from importlib.util import cache_from_source
+from io import StringIO
+from pathlib import Path
+from socketserver import StreamRequestHandler, UnixStreamServer
+from typing import TYPE_CHECKING
+
+from based_utils.cli import LogLevel
+
+from . import log, utils
+from .cli import solve_each
+from .imports import module_path
+from .problems import (
+    CACHE_DIR,
+    NoSolutionFoundError,
+    PuzzleData,
+    end_sessions,
+    forget_sources,
+)
+from .runner import report_entries, write_report
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .runner import Outcome
+
+SOCKET_PATH = CACHE_DIR / "aoc_solve.sock"
+
+# When the source of the puzzle modules was last changed, as they were imported.
+_source_times: dict[str, int] = {}
+
+
+def _load_latest(module_name: str) -> None:
+    """Import the module of a puzzle, again if it has changed since the last time."""
+    path = module_path(module_name)
+    if not path:
+        # Not there (yet): loading the puzzle will tell.
+        return
+    source_time = path.stat().st_mtime_ns
+    if module_name not in sys.modules:
+        import_module(module_name)
+    elif _source_times.get(module_name) != source_time:
+        # The bytecode is only checked by the second: could be from before the change.
+        Path(cache_from_source(str(path))).unlink(missing_ok=True)
+        reload(sys.modules[module_name])
+        forget_sources()
+        log.info(f"Reloaded {module_name}")
+    _source_times[module_name] = source_time
+
+
+class _SolveHandler(StreamRequestHandler):
+    def handle(self) -> None:
+        if not (line := self.rfile.readline()):
+            # Only checking whether a server is running.
+            return
+        request = json.loads(line)
+        puzzles = [PuzzleData(**puzzle) for puzzle in request["puzzles"]]
+        level = LogLevel.DEBUG if request["debug"] else LogLevel.INFO
+        stdout, stderr = StringIO(), StringIO()
+        outcomes: list[Outcome] = []
+        with log.redirected(stdout, stderr), log.context(level):
+            # The input could have changed as well.
+            end_sessions()
+            try:
+                for module_name in {puzzle.module_name for puzzle in puzzles}:
+                    _load_latest(module_name)
+                outcomes, success = solve_each(puzzles)
+            except (
+                FileNotFoundError,
+                ModuleNotFoundError,
+                NoSolutionFoundError,
+            ) as exc:
+                log.error(str(exc))
+                success = False
+            except Exception:  # noqa: BLE001
+                # Reported back, the server should keep running.
+                log.error(traceback.format_exc().rstrip())
+                success = False
+        response = {
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "success": success,
+            "report": report_entries(outcomes),
+        }
+        self.wfile.write(json.dumps(response).encode())
+
+
+def serve(socket_path: Path = SOCKET_PATH) -> None:
+    """Solve puzzles on request, until interrupted."""
+    for module in pkgutil.iter_modules(utils.__path__, f"{utils.__name__}."):
+        import_module(module.name)
+
+    socket_path.parent.mkdir(exist_ok=True)
+    with socket.socket(socket.AF_UNIX) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            # Left behind by a server that didn't stop properly (if there at all).
+            socket_path.unlink(missing_ok=True)
+        else:
+            msg = f"A server is running already at {socket_path}"
+            raise ConnectionError(msg)
+    with UnixStreamServer(str(socket_path), _SolveHandler) as server:
+        log.info(f"Solving puzzles on request at {socket_path} (stop with Ctrl+C)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def request_solve(
+    puzzles: Iterable[PuzzleData],
+    *,
+    debug: bool = False,
+    report: Path = None,
+    socket_path: Path = SOCKET_PATH,
+) -> bool:
+    """Let the server solve the puzzle(s), with its output as if solved here."""
+    request = {"puzzles": [asdict(p) for p in puzzles], "debug": debug}
+    with socket.socket(socket.AF_UNIX) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as exc:
+            msg = "No server running (start one with aoc_solve --serve)"
+            raise ConnectionError(msg) from exc
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        response = json.loads(b"".join(iter(partial(connection.recv, 1 << 16), b"")))
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    if report:
+        write_report(response["report"], report)
+    success: bool = response["success"]
+    return success
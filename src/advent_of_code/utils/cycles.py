@@ -0,0 +1,63 @@
+"""
+Fast-forwarding through (eventually) repeating sequences of states.
+
+A sequence is run through once, until a state shows up again. Only a compact key of
+every state is kept (to recognize it by), along with a value per step (a height,
+a load...) to tell the value at any later step with.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+
+@dataclass(frozen=True)
+class Cycle[V]:
+    # Value at every step, up to (and including) the first repeated state.
+    values: list[V]
+    start: int
+    length: int
+
+    def __getitem__(self, step: int) -> V:
+        """
+        Value at any step, for values that only depend on the state.
+
+        >>> c = find_cycle((n % 3, n % 3 * 10) for n in range(1, 100))
+        >>> c.start, c.length, c[0], c[10**9]
+        (0, 3, 10, 20)
+        """
+        if step >= self.start:
+            step = self.start + (step - self.start) % self.length
+        return self.values[step]
+
+    def extrapolate(self: Cycle[int], step: int) -> int:
+        """
+        Value at any step, for values that grow by the same amount every cycle.
+
+        >>> c = find_cycle((n if n < 2 else n % 2 + 2, n * 5) for n in range(100))
+        >>> c.start, c.length, c.extrapolate(1), c.extrapolate(10**12)
+        (2, 2, 5, 5000000000000)
+        """
+        if step < self.start:
+            return self.values[step]
+        cycles, offset = divmod(step - self.start, self.length)
+        growth = self.values[self.start + self.length] - self.values[self.start]
+        return self.values[self.start + offset] + cycles * growth
+
+
+def find_cycle[V](steps: Iterable[tuple[Hashable, V]]) -> Cycle[V]:
+    """
+    Run through (state key, value) pairs until a key repeats.
+
+    The key should identify the whole state: from equal states on, everything repeats.
+    """
+    seen: dict[Hashable, int] = {}
+    values: list[V] = []
+    for step, (key, value) in enumerate(steps):
+        values.append(value)
+        if (start := seen.get(key)) is not None:
+            return Cycle(values, start, step - start)
+        seen[key] = step
+    raise ValueError(len(values))
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from collections.abc import Mapping, MutableMapping, Set
+from collections.abc import ItemsView, Mapping, MutableMapping, Set, ValuesView
 from dataclasses import dataclass
 from functools import cache, cached_property
+from itertools import chain
 from math import hypot
-from typing import TYPE_CHECKING, Literal, Self
+from typing import TYPE_CHECKING, Any, Literal, Self
 
 from based_utils.class_utils import WithClearablePropertyCache
 from based_utils.cli import term_size
@@ -17,7 +18,9 @@ from advent_of_code import C
 from advent_of_code.utils import lowlighted
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Iterator
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+    from numpy.typing import NDArray
 
 type P2 = tuple[int, int]
 type Range = tuple[int, int]
@@ -265,6 +268,43 @@ class Grid2[T](Mapping[P2, T], ABC):
         for x in range(x_lo, x_hi + 1):
             yield [self[x, y] for y in range(y_lo, y_hi + 1)]
 
+    def as_array(self) -> NDArray[Any]:
+        """
+        Values as a NumPy array, indexed by [y, x] relative to the origin.
+
+        Positions without a value get the default value.
+
+        >>> grid = NumGrid2({(1, 1): 1, (2, 1): 2, (2, 3): 3})
+        >>> grid.as_array().tolist()
+        [[1, 2], [0, 0], [0, 3]]
+        >>> doubled = NumGrid2.from_array(grid.as_array() * 2, origin=grid.origin)
+        >>> list(doubled.rows), doubled.span == grid.span
+        ([[2, 4], [0, 0], [0, 6]], True)
+        """
+        import numpy as np  # noqa: PLC0415 (only needed here, and slow to import)
+
+        return np.array(list(self.rows))
+
+    @classmethod
+    def from_array(
+        cls: type[Self],
+        array: NDArray[Any],
+        *,
+        origin: P2 = (0, 0),
+        default_value: T = None,
+        cyclic: bool = False,
+    ) -> Self:
+        x_lo, y_lo = origin
+        return cls(
+            (
+                ((x_lo + x, y_lo + y), v)
+                for y, row in enumerate(array.tolist())
+                for x, v in enumerate(row)
+            ),
+            default_value=default_value,
+            cyclic=cyclic,
+        )
+
     def point_with_value(self, value: T) -> P2:
         try:
             point, *_ = self.points_with_value(value)
@@ -390,6 +430,200 @@ class BitGrid2(Grid2[bool]):
         return lowlighted(c_good if value else c_bad)("#" if value else ".")
 
 
+def is_dense(lines: Sequence[str], ignore: str = " ") -> bool:
+    """
+    Whether the lines fill up a rectangle, without any characters to ignore.
+
+    >>> is_dense(["#.#", "..#"]), is_dense(["#.#", ".."]), is_dense(["# #", "..#"])
+    (True, False, False)
+    """
+    return len({len(line) for line in lines}) == 1 and not any(
+        c in line for line in lines for c in ignore
+    )
+
+
+class _DenseItemsView[T](ItemsView[P2, T]):
+    _mapping: _DenseGrid2[T]
+
+    def __iter__(self) -> Iterator[tuple[P2, T]]:
+        return zip(self._mapping, self._mapping.values(), strict=True)
+
+
+class _DenseValuesView[T](ValuesView[T]):
+    _mapping: _DenseGrid2[T]
+
+    def __iter__(self) -> Iterator[T]:
+        return chain.from_iterable(self._mapping.rows)
+
+
+class _DenseGrid2[T](Grid2[T], ABC):
+    """
+    Grid filling up a rectangle completely, as most puzzle inputs do.
+
+    Values are stored row by row in a flat list, so looking one up is a matter of
+    indexing instead of hashing a tuple to find it in a dict.
+
+    >>> grid = DenseNumGrid2.from_lines(["123", "456"])
+    >>> list(grid.rows), grid[2, 1], len(grid), grid.span
+    ([[1, 2, 3], [4, 5, 6]], 6, 6, ((0, 0), (2, 1)))
+    >>> list(grid.neighbors((0, 1)))
+    [((0, 0), 1), ((1, 1), 5)]
+    >>> grid[3, 1]
+    Traceback (most recent call last):
+        ...
+    KeyError: (3, 1)
+    >>> DenseNumGrid2({(1, 1): 1, (2, 1): 2, (2, 2): 3})
+    Traceback (most recent call last):
+        ...
+    ValueError: (1, 2)
+    """
+
+    def __init__(
+        self,
+        items: Mapping[P2, T] | Iterable[tuple[P2, T]] | None = None,
+        *,
+        rows: Iterable[Iterable[T]] = None,
+        default_value: T = None,
+        cyclic: bool = False,
+    ) -> None:
+        super().__init__(default_value=default_value, cyclic=cyclic)
+        self._x_lo, self._y_lo = 0, 0
+        if items:
+            grid: dict[P2, T] = dict(items)
+            xs, ys = [x for x, _ in grid], [y for _, y in grid]
+            self._x_lo, self._y_lo = min(xs), min(ys)
+            try:
+                rows = [
+                    [grid[x, y] for x in range(self._x_lo, max(xs) + 1)]
+                    for y in range(self._y_lo, max(ys) + 1)
+                ]
+            except KeyError as e:
+                raise ValueError(*e.args) from e
+
+        values: list[T] = []
+        self._width, self._height = 0, 0
+        for row in rows or []:
+            values.extend(row)
+            self._height += 1
+            if self._width == 0:
+                self._width = len(values)
+            elif len(values) != self._width * self._height:
+                raise ValueError(self._height - 1)
+        self._values = values
+
+        # Offsets in the flat list of values, for every (cardinal) direction.
+        self._offsets = [
+            (dx, dy, dy * self._width + dx) for dx, dy in cardinal_directions
+        ]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[P2]:
+        (x_lo, y_lo), (x_hi, y_hi) = self.span
+        for y in range(y_lo, y_hi + 1):
+            for x in range(x_lo, x_hi + 1):
+                yield x, y
+
+    def __getitem__(self, pos: P2) -> T:
+        if not self._values:
+            raise KeyError(pos)
+
+        x, y = pos
+        x, y, w, h = x - self._x_lo, y - self._y_lo, self._width, self._height
+        if self.cyclic:
+            x, y = x % w, y % h
+        elif not (0 <= x < w and 0 <= y < h):
+            raise KeyError(pos)
+
+        return self._values[y * w + x]
+
+    def __contains__(self, pos: object) -> bool:
+        if not isinstance(pos, tuple) or len(pos) != 2:
+            return False
+        x, y = pos
+        return 0 <= x - self._x_lo < self._width and 0 <= y - self._y_lo < self._height
+
+    def __or__(self, other: Mapping[P2, T]) -> Self:
+        return self.__class__(
+            dict(self.items()) | dict(other),
+            default_value=self._default_value,
+            cyclic=self.cyclic,
+        )
+
+    def items(self) -> ItemsView[P2, T]:
+        return _DenseItemsView(self)
+
+    def values(self) -> ValuesView[T]:
+        return _DenseValuesView(self)
+
+    @cached_property
+    def x_range(self) -> tuple[int, int]:
+        return self._x_lo, self._x_lo + self._width - 1
+
+    @cached_property
+    def y_range(self) -> tuple[int, int]:
+        return self._y_lo, self._y_lo + self._height - 1
+
+    @property
+    def rows(self) -> Iterator[list[T]]:
+        w = self._width
+        for i in range(0, len(self._values), w):
+            yield self._values[i : i + w]
+
+    @property
+    def columns(self) -> Iterator[list[T]]:
+        for x in range(self._width):
+            yield self._values[x :: self._width]
+
+    def neighbors(
+        self, pos: P2, directions: Iterable[P2] = None
+    ) -> Iterator[tuple[P2, T]]:
+        if self.cyclic:
+            yield from super().neighbors(pos, directions)
+            return
+
+        x, y = pos
+        x_lo, y_lo, w, h = self._x_lo, self._y_lo, self._width, self._height
+        i = (y - y_lo) * w + x - x_lo
+        offsets = (
+            [(dx, dy, dy * w + dx) for dx, dy in directions]
+            if directions
+            else self._offsets
+        )
+        for dx, dy, offset in offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx - x_lo < w and 0 <= ny - y_lo < h:
+                yield (nx, ny), self._values[i + offset]
+
+    @classmethod
+    def from_lines(
+        cls: type[Self],
+        lines: Iterable[str],
+        *,
+        parse_value: Callable[[str], T] = None,
+        ignore: str = " ",
+    ) -> Self:
+        lines = list(lines)
+        if not is_dense(lines, ignore):
+            msg = "Lines should fill up a rectangle, without characters to ignore."
+            raise ValueError(msg)
+        parse_value = parse_value or cls._parse_value
+        return cls(rows=([parse_value(c) for c in line] for line in lines))
+
+
+class DenseCharGrid2(CharGrid2, _DenseGrid2[str]):
+    pass
+
+
+class DenseNumGrid2(NumGrid2, _DenseGrid2[int]):
+    pass
+
+
+class DenseBitGrid2(BitGrid2, _DenseGrid2[bool]):
+    pass
+
+
 class _MutableGrid2[T](
     Grid2[T], MutableMapping[P2, T], WithClearablePropertyCache, ABC
 ):
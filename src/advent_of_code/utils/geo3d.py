@@ -101,7 +101,8 @@ class P3D(NamedTuple):
                                Z       x       y
         (x, y, z) transform (2, a), (0, b), (1, c) =  (z * a, x * b, y * c).
         """
-        return P3D(*[self[i] * n for i, n in transformation])  # pylint: disable=unsubscriptable-object
+        (i, a), (j, b), (k, c) = transformation
+        return P3D(self[i] * a, self[j] * b, self[k] * c)
 
     # def inv_transform(self, transformation: Trans3) -> P3D:
     #     """Something.
@@ -217,6 +218,61 @@ class Span3D:
                     yield P3D(x, y, z)
 
 
+def volume_switched_on(
+    steps: Iterable[tuple[Span3D, bool]], *, max_cells: int = 1 << 22
+) -> int:
+    """
+    Volume that's on after switching cuboids on or off, one after the other.
+
+    Space is cut into cells at every boundary of the cuboids (coordinate
+    compression), so every cuboid covers a block of whole cells. The cells are
+    processed in slabs along x, of at most max_cells each, to bound memory.
+
+    >>> a, b = Span3D(P3D(0, 0, 0), P3D(2, 2, 2)), Span3D(P3D(1, 1, 1), P3D(3, 3, 3))
+    >>> volume_switched_on([(a, True), (b, True), (a & b, False)])
+    38
+    """
+    import numpy as np  # noqa: PLC0415 (only needed here, and slow to import)
+
+    steps = list(steps)
+    if not steps:
+        return 0
+
+    bounds = [
+        np.unique(
+            [b for span, _ in steps for b in (span.p_min[axis], span.p_max[axis] + 1)]
+        )
+        for axis in range(3)
+    ]
+    # Cells covered by every cuboid, per axis.
+    blocks = [
+        (
+            [
+                (int(np.searchsorted(b, lo)), int(np.searchsorted(b, hi + 1)))
+                for b, lo, hi in zip(bounds, span.p_min, span.p_max, strict=True)
+            ],
+            on,
+        )
+        for span, on in steps
+    ]
+    dx, dy, dz = (np.diff(b) for b in bounds)
+    # Floats make for a faster matrix product, and the lengths along z (summed per
+    # row of cells) are small enough to stay exact.
+    dz_f = dz.astype(np.float64)
+    slab = max(1, max_cells // (len(dy) * len(dz)))
+
+    volume = 0
+    for x_lo in range(0, len(dx), slab):
+        x_hi = min(x_lo + slab, len(dx))
+        cells = np.zeros((x_hi - x_lo, len(dy), len(dz)), dtype=bool)
+        for ((x1, x2), (y1, y2), (z1, z2)), on in blocks:
+            if x1 < x_hi and x2 > x_lo:
+                cells[max(x1, x_lo) - x_lo : min(x2, x_hi) - x_lo, y1:y2, z1:z2] = on
+        lengths = (cells.astype(np.float64) @ dz_f).astype(np.int64)
+        volume += int(dx[x_lo:x_hi] @ lengths @ dy)
+    return volume
+
+
 # TODO: inherit from Mapping / make similar to Grid2
 class Grid3D(dict[P3D, int]):
     def __init__(
@@ -229,7 +285,7 @@ class Grid3D(dict[P3D, int]):
         else:
             super().__init__({})
 
-    @property
+    @cached_property
     def span(self) -> tuple[P3D, P3D]:
         xs, ys, zs = transpose(self.keys())
         return P3D(min(xs), min(ys), min(zs)), P3D(max(xs), max(ys), max(zs))
@@ -361,6 +417,7 @@ ROTATIONS_3D = [
     Trans3((2, -1), (0, -1), (1, 1)),
 ]
 
+
 # ROTATIONS_3D = [
 #     Transform3D(
 #         (x, a),
@@ -0,0 +1,128 @@
+"""
+Whole-grid operations on NumPy arrays (as returned by Grid2.as_array()).
+
+Arrays are indexed by [y, x], relative to the origin of the grid.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .geo2d import all_directions
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import NDArray
+
+    from .geo2d import P2, Side
+
+
+def points_with_value(
+    array: NDArray[Any], *values: str | int, origin: P2 = (0, 0)
+) -> frozenset[P2]:
+    """
+    Positions of all values in the array that are one of the given values.
+
+    >>> a = np.array([["#", "."], [".", "O"], ["#", "#"]])
+    >>> sorted(points_with_value(a, "#", "O"))
+    [(0, 0), (0, 2), (1, 1), (1, 2)]
+    >>> sorted(points_with_value(a, "#", origin=(5, 10)))
+    [(5, 10), (5, 12), (6, 12)]
+    """
+    x_lo, y_lo = origin
+    ys, xs = np.nonzero(np.isin(array, values))
+    return frozenset(zip((xs + x_lo).tolist(), (ys + y_lo).tolist(), strict=True))
+
+
+def count(array: NDArray[Any], *values: str | int) -> int:
+    """
+    Count the values in the array that are one of the given values.
+
+    >>> count(np.array([["#", "."], [".", "O"], ["#", "#"]]), "#", "O")
+    4
+    """
+    return int(np.isin(array, values).sum())
+
+
+def rotate(array: NDArray[Any], side: Side = "R") -> NDArray[Any]:
+    """
+    Rotate (a quarter turn) to the right (clockwise) or to the left.
+
+    >>> a = np.array([[1, 2, 3], [4, 5, 6]])
+    >>> rotate(a).tolist(), rotate(a, "L").tolist()
+    ([[4, 1], [5, 2], [6, 3]], [[3, 6], [2, 5], [1, 4]])
+    """
+    return np.rot90(array, -1 if side == "R" else 1)
+
+
+def neighbor_counts(
+    mask: NDArray[np.bool], directions: Iterable[P2] = None, *, cyclic: bool = False
+) -> NDArray[np.int_]:
+    """
+    Count the neighbors (in all directions by default) that are set, per position.
+
+    >>> m = np.array([[1, 0, 0], [0, 1, 0], [0, 1, 1]], dtype=bool)
+    >>> neighbor_counts(m).tolist()
+    [[1, 2, 1], [3, 3, 3], [2, 2, 2]]
+    >>> neighbor_counts(m, cyclic=True).tolist()
+    [[3, 4, 4], [4, 3, 4], [4, 3, 3]]
+    """
+    directions = list(directions or all_directions)
+    counts = np.zeros(mask.shape, dtype=np.int_)
+    if cyclic:
+        for dx, dy in directions:
+            counts += np.roll(mask, (-dy, -dx), axis=(0, 1))
+        return counts
+
+    r = max(max(abs(dx), abs(dy)) for dx, dy in directions)
+    padded = np.pad(mask, r)
+    h, w = mask.shape
+    for dx, dy in directions:
+        counts += padded[r + dy : r + dy + h, r + dx : r + dx + w]
+    return counts
+
+
+def neighborhood_codes(
+    mask: NDArray[np.bool], *, background: bool = False
+) -> NDArray[np.int_]:
+    """
+    Read the bits of the 3x3 neighborhood of every position as a number.
+
+    The bits are read row by row, from the top left (the most significant bit).
+    Positions outside of the mask all have the background value, so the result
+    is one position larger than the mask on every side.
+
+    >>> m = np.array([[1, 0], [0, 1]], dtype=bool)
+    >>> neighborhood_codes(m).tolist()
+    [[1, 2, 4, 0], [8, 17, 34, 4], [64, 136, 272, 32], [0, 64, 128, 256]]
+    >>> neighborhood_codes(m, background=True)[0].tolist()
+    [511, 510, 509, 507]
+    """
+    h, w = mask.shape
+    padded = np.pad(mask, 2, constant_values=background)
+    codes = np.zeros((h + 2, w + 2), dtype=np.int_)
+    for dy in range(3):
+        for dx in range(3):
+            codes <<= 1
+            codes |= padded[dy : dy + h + 2, dx : dx + w + 2]
+    return codes
+
+
+def apply_rule(
+    mask: NDArray[np.bool], rule: NDArray[np.bool], *, background: bool = False
+) -> tuple[NDArray[np.bool], bool]:
+    """
+    One step of a cellular automaton on an infinite plane.
+
+    The rule tells the next value of a position for every (3x3) neighborhood code.
+    Returns the next mask (one position larger on every side) and the next value
+    of all positions outside of it, which flips every step for some rules.
+
+    >>> rule = np.array([bin(c).count("1") == 3 for c in range(512)])
+    >>> mask, background = apply_rule(np.ones((1, 3), dtype=bool), rule)
+    >>> mask.astype(int).tolist(), background
+    ([[0, 0, 1, 0, 0], [0, 0, 1, 0, 0], [0, 0, 1, 0, 0]], False)
+    """
+    next_background = bool(rule[-1 if background else 0])
+    return rule[neighborhood_codes(mask, background=background)], next_background
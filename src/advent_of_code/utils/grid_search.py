@@ -0,0 +1,366 @@
+"""
+Shortest paths on rectangular grids, with cells addressed by a flat index.
+
+A cell at (x, y) (relative to the origin) has index y * width + x.
+Distances and parents are kept in flat lists rather than in dicts of tuples,
+so nothing is created or hashed per visited cell.
+
+Optionally, every cell has a number of modes: extra state to search through,
+like the direction a cell was entered from. A search state is then
+cell * number of modes + mode.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from functools import cached_property
+from heapq import heappop, heappush
+from itertools import product
+from sys import maxsize
+from typing import TYPE_CHECKING
+
+from based_utils.algo import NoPathFoundError
+
+from .geo2d import DOWN, LEFT, RIGHT, UP
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .geo2d import P2, Grid2
+
+# Clockwise, so turning is ± 1 and reversing is + 2 (modulo 4).
+DIRECTIONS: list[P2] = [UP, RIGHT, DOWN, LEFT]
+
+UNREACHED = maxsize
+
+# Cost of stepping onto a cell, None for cells that can't be entered.
+type Cost = int | None
+
+
+@dataclass(frozen=True)
+class Modes:
+    """Extra state per cell, and how it changes by stepping in a direction."""
+
+    count: int
+    # Mode after stepping in the given direction (index), None if not allowed.
+    step: Callable[[int, int], int | None]
+    start: int = 0
+    is_end: Callable[[int], bool] = lambda _mode: True
+
+
+_SINGLE_MODE = Modes(1, lambda mode, _direction: mode)
+
+
+@dataclass(frozen=True)
+class GridPaths:
+    graph: GridGraph
+    modes: Modes
+    distances: list[int]
+    parents: list[int]
+    end: int | None
+
+    def distance(self, pos: P2) -> int | None:
+        """Shortest distance to the given position (in any mode)."""
+        n = self.modes.count
+        cell = self.graph.cell(pos)
+        d = min(self.distances[cell * n : (cell + 1) * n])
+        return None if d == UNREACHED else d
+
+    @property
+    def length(self) -> int:
+        if self.end is None:
+            raise NoPathFoundError
+        return self.distances[self.end]
+
+    def _states_to(self, state: int) -> Iterator[int]:
+        while state >= 0:
+            yield state
+            state = self.parents[state]
+
+    @property
+    def path(self) -> list[P2]:
+        """Positions from start to end."""
+        if self.end is None:
+            raise NoPathFoundError
+        n = self.modes.count
+        return [self.graph.pos(s // n) for s in self._states_to(self.end)][::-1]
+
+
+class GridGraph:
+    """
+    Grid of step costs to search through.
+
+    >>> from advent_of_code.utils.geo2d import NumGrid2
+    >>> g = GridGraph.from_grid(NumGrid2.from_lines(["131", "191", "111"]))
+    >>> paths = g.dijkstra((0, 0), (2, 2))
+    >>> paths.length, paths.path
+    (4, [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)])
+    >>> g.bfs((0, 0), (2, 2)).length
+    4
+    >>> g.a_star((0, 0), (2, 2)).length
+    4
+    >>> tiled = g.tiled((2, 2), lambda cost, tile: cost + sum(tile))
+    >>> tiled.size, tiled.dijkstra((0, 0), (5, 5)).length
+    ((6, 6), 19)
+    """
+
+    def __init__(
+        self,
+        costs: Iterable[Cost],
+        width: int,
+        *,
+        origin: P2 = (0, 0),
+        cyclic: bool = False,
+    ) -> None:
+        self.costs = list(costs)
+        self.width = width
+        self.height = len(self.costs) // width
+        self.origin = origin
+        self.cyclic = cyclic
+        # Size of (and cost function for) the tiles of a tiled graph.
+        self.tile_size = self.size
+        self.tile_cost: Callable[[int, P2], int] | None = None
+
+    @classmethod
+    def from_grid[T](
+        cls, grid: Grid2[T], cost: Callable[[T], Cost] = None
+    ) -> GridGraph:
+        """
+        Graph from the values in a grid (or the costs derived from them).
+
+        Cyclic grids result in a graph that wraps around its edges.
+        """
+        return cls(
+            (
+                cost(value) if cost else value  # type: ignore[misc]
+                for row in grid.rows
+                for value in row
+            ),
+            grid.width,
+            origin=grid.origin,
+            cyclic=grid.cyclic,
+        )
+
+    def tiled(
+        self, repeat: P2, tile_cost: Callable[[int, P2], int] = None
+    ) -> GridGraph:
+        """
+        Graph of this grid repeated a number of times in both directions.
+
+        The tiles aren't created: the cost of a cell in tile (i, j) is derived from
+        the cost of the corresponding cell in this grid, when it's needed.
+        """
+        graph = GridGraph(
+            self.costs, self.width, origin=self.origin, cyclic=self.cyclic
+        )
+        rx, ry = repeat
+        graph.width, graph.height = self.width * rx, self.height * ry
+        graph.tile_cost = tile_cost or (lambda cost, _tile: cost)
+        return graph
+
+    @property
+    def size(self) -> P2:
+        return self.width, self.height
+
+    def cell(self, pos: P2) -> int:
+        x, y = pos
+        x_lo, y_lo = self.origin
+        return (y - y_lo) * self.width + x - x_lo
+
+    def pos(self, cell: int) -> P2:
+        y, x = divmod(cell, self.width)
+        x_lo, y_lo = self.origin
+        return x + x_lo, y + y_lo
+
+    @cached_property
+    def _tile_costs(self) -> dict[P2, dict[int, int]]:
+        """Cost in every tile, for every (distinct) cost in the original grid."""
+        assert self.tile_cost
+        tw, th = self.tile_size
+        costs = {c for c in self.costs if c is not None}
+        return {
+            tile: {c: self.tile_cost(c, tile) for c in costs}
+            for tile in product(range(self.width // tw), range(self.height // th))
+        }
+
+    def cost(self, cell: int) -> Cost:
+        if self.tile_cost is None:
+            return self.costs[cell]
+
+        y, x = divmod(cell, self.width)
+        tw, th = self.tile_size
+        (i, tx), (j, ty) = divmod(x, tw), divmod(y, th)
+        cost = self.costs[ty * tw + tx]
+        return None if cost is None else self._tile_costs[i, j][cost]
+
+    @cached_property
+    def _offsets(self) -> list[tuple[int, int, int]]:
+        return [(dx, dy, dy * self.width + dx) for dx, dy in DIRECTIONS]
+
+    @cached_property
+    def min_cost(self) -> int:
+        """Lowest cost of any step, for A* to estimate the cost left with."""
+        if self.tile_cost is None:
+            return min(c for c in self.costs if c is not None)
+        return min(min(costs.values()) for costs in self._tile_costs.values())
+
+    def _successors(self, state: int, modes: Modes) -> list[tuple[int, int]]:
+        """Next states, with the cost to step to them."""
+        n, w, h = modes.count, self.width, self.height
+        cell, mode = divmod(state, n)
+        y, x = divmod(cell, w)
+        cost_of = self.cost if self.tile_cost else self.costs.__getitem__
+        step = modes.step if n > 1 else None
+        successors = []
+        for d, (dx, dy, offset) in enumerate(self._offsets):
+            nx, ny = x + dx, y + dy
+            if self.cyclic:
+                next_cell = ny % h * w + nx % w
+            elif 0 <= nx < w and 0 <= ny < h:
+                next_cell = cell + offset
+            else:
+                continue
+            if (cost := cost_of(next_cell)) is None:
+                continue
+            if step is None:
+                successors.append((next_cell, cost))
+            elif (next_mode := step(mode, d)) is not None:
+                successors.append((next_cell * n + next_mode, cost))
+        return successors
+
+    def _init(
+        self, start: P2, end: P2 | None, modes: Modes
+    ) -> tuple[int, Callable[[int], bool], list[int], list[int]]:
+        n = modes.count
+        start_state = self.cell(start) * n + modes.start
+        end_cell = -1 if end is None else self.cell(end)
+
+        def is_end(state: int) -> bool:
+            cell, mode = divmod(state, n)
+            return cell == end_cell and modes.is_end(mode)
+
+        distances = [UNREACHED] * (self.width * self.height * n)
+        distances[start_state] = 0
+        parents = [-1] * len(distances)
+        return start_state, is_end, distances, parents
+
+    def bfs(self, start: P2, end: P2 = None, modes: Modes = None) -> GridPaths:
+        """
+        Breadth first search: every step costs 1, regardless of the cell costs.
+
+        Without an end, all reachable cells are visited.
+        """
+        modes = modes or _SINGLE_MODE
+        start_state, is_end, distances, parents = self._init(start, end, modes)
+        queue = deque([start_state])
+        while queue:
+            state = queue.popleft()
+            if is_end(state):
+                return GridPaths(self, modes, distances, parents, state)
+            distance = distances[state] + 1
+            for next_state, _ in self._successors(state, modes):
+                if distances[next_state] == UNREACHED:
+                    distances[next_state] = distance
+                    parents[next_state] = state
+                    queue.append(next_state)
+        return self._no_path(modes, distances, parents, end)
+
+    def zero_one_bfs(self, start: P2, end: P2 = None, modes: Modes = None) -> GridPaths:
+        """Breadth first search for grids with costs of 0 or 1 only."""
+        modes = modes or _SINGLE_MODE
+        start_state, is_end, distances, parents = self._init(start, end, modes)
+        queue = deque([start_state])
+        done = [False] * len(distances)
+        while queue:
+            state = queue.popleft()
+            if done[state]:
+                continue
+            done[state] = True
+            if is_end(state):
+                return GridPaths(self, modes, distances, parents, state)
+            for next_state, cost in self._successors(state, modes):
+                distance = distances[state] + cost
+                if distance < distances[next_state]:
+                    distances[next_state] = distance
+                    parents[next_state] = state
+                    if cost:
+                        queue.append(next_state)
+                    else:
+                        queue.appendleft(next_state)
+        return self._no_path(modes, distances, parents, end)
+
+    def dijkstra(self, start: P2, end: P2 = None, modes: Modes = None) -> GridPaths:
+        """
+        Dijkstra's algorithm, with a bucket (instead of a heap) per distance.
+
+        Works best for small (non-negative) costs: the buckets are visited in order
+        of distance, one by one.
+        """
+        modes = modes or _SINGLE_MODE
+        start_state, is_end, distances, parents = self._init(start, end, modes)
+        buckets: defaultdict[int, list[int]] = defaultdict(list)
+        buckets[0].append(start_state)
+        distance = 0
+        while buckets:
+            bucket = buckets.pop(distance, [])
+            while bucket:
+                state = bucket.pop()
+                if distances[state] < distance:
+                    # Reached this state in a cheaper way already.
+                    continue
+                if is_end(state):
+                    return GridPaths(self, modes, distances, parents, state)
+                for next_state, cost in self._successors(state, modes):
+                    next_distance = distance + cost
+                    if next_distance < distances[next_state]:
+                        distances[next_state] = next_distance
+                        parents[next_state] = state
+                        # Steps that cost nothing end up in the current bucket.
+                        (bucket if not cost else buckets[next_distance]).append(
+                            next_state
+                        )
+            distance += 1
+        return self._no_path(modes, distances, parents, end)
+
+    def a_star(self, start: P2, end: P2, modes: Modes = None) -> GridPaths:
+        """Search guided by the Manhattan distance to the end (times the min cost)."""
+        modes = modes or _SINGLE_MODE
+        start_state, is_end, distances, parents = self._init(start, end, modes)
+        n, w, h = modes.count, self.width, self.height
+        ey, ex = divmod(self.cell(end), w)
+        min_cost = self.min_cost
+
+        def heuristic(state: int) -> int:
+            y, x = divmod(state // n, w)
+            dx, dy = abs(ex - x), abs(ey - y)
+            if self.cyclic:
+                dx, dy = min(dx, w - dx), min(dy, h - dy)
+            return (dx + dy) * min_cost
+
+        queue = [(heuristic(start_state), 0, start_state)]
+        while queue:
+            _, distance, state = heappop(queue)
+            if distance > distances[state]:
+                continue
+            if is_end(state):
+                return GridPaths(self, modes, distances, parents, state)
+            for next_state, cost in self._successors(state, modes):
+                next_distance = distance + cost
+                if next_distance < distances[next_state]:
+                    distances[next_state] = next_distance
+                    parents[next_state] = state
+                    heappush(
+                        queue,
+                        (
+                            next_distance + heuristic(next_state),
+                            next_distance,
+                            next_state,
+                        ),
+                    )
+        return self._no_path(modes, distances, parents, end)
+
+    def _no_path(
+        self, modes: Modes, distances: list[int], parents: list[int], end: P2 | None
+    ) -> GridPaths:
+        if end is not None:
+            raise NoPathFoundError
+        return GridPaths(self, modes, distances, parents, None)
@@ -0,0 +1,184 @@
+"""
+Arithmetic on (sets of) integer ranges.
+
+Ranges are half-open: (start, end) contains start up to (but not including) end.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import pairwise
+from math import prod
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from .geo2d import Range
+
+# Hyper-rectangle: a range per dimension.
+type Box = tuple[Range, ...]
+
+
+class IntervalSet:
+    """
+    Sorted set of non-overlapping, non-adjacent ranges.
+
+    >>> s = IntervalSet([(5, 8), (1, 3)])
+    >>> s.add(3, 4)
+    >>> list(s), s.size, 2 in s, 4 in s
+    ([(1, 4), (5, 8)], 6, True, False)
+    >>> s.add(0, 6)
+    >>> list(s), s.min
+    ([(0, 8)], 0)
+    """
+
+    def __init__(self, ranges: Iterable[Range] = ()) -> None:
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        for start, end in ranges:
+            self.add(start, end)
+
+    def add(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        # Ranges that overlap with (or are adjacent to) the new one are merged in.
+        i = bisect_left(self._ends, start)
+        j = bisect_right(self._starts, end)
+        if i < j:
+            start = min(start, self._starts[i])
+            end = max(end, self._ends[j - 1])
+        self._starts[i:j] = [start]
+        self._ends[i:j] = [end]
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int):
+            return False
+        i = bisect_right(self._starts, value) - 1
+        return i >= 0 and value < self._ends[i]
+
+    def __iter__(self) -> Iterator[Range]:
+        return zip(self._starts, self._ends, strict=True)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def size(self) -> int:
+        """Number of values in the set."""
+        return sum(self._ends) - sum(self._starts)
+
+    @property
+    def min(self) -> int:
+        return self._starts[0]
+
+    @property
+    def max(self) -> int:
+        return self._ends[-1] - 1
+
+
+class RangeMap:
+    """
+    Piecewise shift of integers: every piece maps its range by adding an offset.
+
+    Values outside of all pieces map to themselves.
+
+    >>> m = RangeMap([(0, 10, 100)])
+    >>> m(5), m(10)
+    (105, 10)
+    >>> n = m.then(RangeMap([(100, 103, -50)]))
+    >>> n(1), n(5), list(n.pieces)
+    (51, 105, [(0, 3, 50), (3, 10, 100), (100, 103, -50)])
+    >>> list(n.image([(-2, 4)]))
+    [(-2, 0), (50, 53), (103, 104)]
+    """
+
+    def __init__(self, pieces: Iterable[tuple[int, int, int]] = ()) -> None:
+        offsets: dict[int, int] = {}
+        for start, end, offset in pieces:
+            offsets[start] = offset
+            offsets.setdefault(end, 0)
+
+        # The offset from each breakpoint on (up to the next one).
+        # Before the first breakpoint, the offset is 0.
+        self.breakpoints: list[int] = []
+        self._offsets: list[int] = []
+        previous = 0
+        for breakpoint_, offset in sorted(offsets.items()):
+            if offset != previous:
+                self.breakpoints.append(breakpoint_)
+                self._offsets.append(offset)
+                previous = offset
+
+    def offset(self, value: int) -> int:
+        i = bisect_right(self.breakpoints, value) - 1
+        return self._offsets[i] if i >= 0 else 0
+
+    def __call__(self, value: int) -> int:
+        return value + self.offset(value)
+
+    @property
+    def pieces(self) -> Iterator[tuple[int, int, int]]:
+        """Ranges that are shifted, with the offset they're shifted by."""
+        for i, (start, offset) in enumerate(
+            zip(self.breakpoints, self._offsets, strict=True)
+        ):
+            if offset:
+                yield start, self.breakpoints[i + 1], offset
+
+    def then(self, other: RangeMap) -> RangeMap:
+        """Map that does the same as applying this map and the other one after."""
+        breakpoints = set(self.breakpoints)
+        # Add the values that this map sends to a breakpoint of the other map.
+        bounds = [None, *self.breakpoints, None]
+        for lo, hi in pairwise(bounds):
+            offset = 0 if lo is None else self.offset(lo)
+            i = 0 if lo is None else bisect_left(other.breakpoints, lo + offset)
+            j = (
+                len(other.breakpoints)
+                if hi is None
+                else bisect_left(other.breakpoints, hi + offset)
+            )
+            breakpoints.update(b - offset for b in other.breakpoints[i:j])
+
+        cuts = sorted(breakpoints)
+        return RangeMap(
+            (lo, hi, self.offset(lo) + other.offset(self(lo)))
+            for lo, hi in pairwise(cuts)
+        )
+
+    def image(self, ranges: Iterable[Range]) -> IntervalSet:
+        """All values the given ranges map to."""
+        result = IntervalSet()
+        for start, end in ranges:
+            i = bisect_right(self.breakpoints, start)
+            j = bisect_left(self.breakpoints, end)
+            cuts = [start, *self.breakpoints[i:j], end]
+            for lo, hi in pairwise(cuts):
+                offset = self.offset(lo)
+                result.add(lo + offset, hi + offset)
+        return result
+
+
+def volume(box: Sequence[Range]) -> int:
+    """
+    Count the points in a box.
+
+    >>> volume(((0, 2), (1, 4), (5, 6))), volume(((0, 2), (4, 1)))
+    (6, 0)
+    """
+    return prod(max(0, end - start) for start, end in box)
+
+
+def intersect_boxes(box_1: Box, box_2: Box) -> Box | None:
+    """
+    Box that's in both boxes, None if they don't overlap.
+
+    >>> intersect_boxes(((0, 5), (0, 5)), ((3, 8), (-2, 1)))
+    ((3, 5), (0, 1))
+    >>> intersect_boxes(((0, 5), (0, 5)), ((5, 8), (0, 5))) is None
+    True
+    """
+    box = tuple(
+        (max(s1, s2), min(e1, e2))
+        for (s1, e1), (s2, e2) in zip(box_1, box_2, strict=True)
+    )
+    return box if all(start < end for start, end in box) else None
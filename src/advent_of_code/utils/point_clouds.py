@@ -0,0 +1,208 @@
+"""
+Sets of 3D points as NumPy arrays, for operations on all points at once.
+
+Points are stored as an (N, 3) array of integers. For set operations, every point
+is packed into a single integer as well.
+"""
+
+import heapq
+from collections import Counter
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, Self
+
+import numpy as np
+
+from .geo3d import P3D, ROTATIONS_3D
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from numpy.typing import NDArray
+
+    from .geo3d import Trans3
+
+# Room for coordinates in [-2^20, 2^20) in 21 bits each.
+_PACK_OFFSET = 1 << 20
+
+
+def _packed(points: NDArray[np.int64]) -> NDArray[np.int64]:
+    shifted = points + _PACK_OFFSET
+    return (shifted[:, 0] << 42) | (shifted[:, 1] << 21) | shifted[:, 2]
+
+
+def rotation_matrix(rotation: Trans3) -> NDArray[np.int64]:
+    """
+    Matrix that transforms (column) vectors like the given transformation.
+
+    >>> from .geo3d import Rotation90deg3D
+    >>> rotation_matrix(Rotation90deg3D.z_cw).tolist()
+    [[0, -1, 0], [1, 0, 0], [0, 0, 1]]
+    """
+    matrix = np.zeros((3, 3), dtype=np.int64)
+    for row, (axis, sign) in enumerate(rotation):
+        matrix[row, axis] = sign
+    return matrix
+
+
+@cache
+def rotation_matrices() -> NDArray[np.int64]:
+    """Matrices of all 24 rotations, stacked."""
+    return np.stack([rotation_matrix(r) for r in ROTATIONS_3D])
+
+
+# Rotation matrix & offset: maps points p onto rotation @ p + offset.
+type Pose3 = tuple[NDArray[np.int64], NDArray[np.int64]]
+
+
+class PointCloud3:
+    """
+    Set of 3D points.
+
+    >>> cloud = PointCloud3([P3D(1, 2, 3), P3D(0, 0, 1), P3D(1, 2, 3)])
+    >>> len(cloud), cloud.to_points(), cloud.span
+    (2, [P3D(x=0, y=0, z=1), P3D(x=1, y=2, z=3)], (P3D(x=0, y=0, z=1), P3D(x=1, y=2, z=3)))
+    >>> moved = cloud.moved(P3D(1, 0, 0))
+    >>> len(cloud & moved), len(cloud | moved), P3D(2, 2, 3) in moved
+    (0, 4, True)
+    >>> [p.to_points() for p in cloud.rotations()][1]
+    [P3D(x=0, y=1, z=0), P3D(x=1, y=3, z=-2)]
+    """
+
+    def __init__(self, points: Iterable[P3D]) -> None:
+        self._set_array(np.array(list(points), dtype=np.int64).reshape(-1, 3))
+
+    def _set_array(self, array: NDArray[np.int64]) -> None:
+        # Ordered by packed coordinates, without duplicates.
+        keys, indices = np.unique(_packed(array), return_index=True)
+        self.array, self.keys = array[indices], keys
+
+    @classmethod
+    def from_array(cls, array: NDArray[np.int64]) -> Self:
+        cloud = cls([])
+        cloud._set_array(array.astype(np.int64).reshape(-1, 3))
+        return cloud
+
+    def to_points(self) -> list[P3D]:
+        return [P3D(*p) for p in self.array.tolist()]
+
+    def __iter__(self) -> Iterator[P3D]:
+        return iter(self.to_points())
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __contains__(self, point: object) -> bool:
+        if not isinstance(point, tuple):
+            return False
+        key = _packed(np.array([point], dtype=np.int64))[0]
+        i = np.searchsorted(self.keys, key)
+        return bool(i < len(self.keys) and self.keys[i] == key)
+
+    def __and__(self, other: PointCloud3) -> PointCloud3:
+        _, i, _ = np.intersect1d(
+            self.keys, other.keys, assume_unique=True, return_indices=True
+        )
+        return PointCloud3.from_array(self.array[i])
+
+    def __or__(self, other: PointCloud3) -> PointCloud3:
+        return PointCloud3.from_array(np.concatenate([self.array, other.array]))
+
+    def overlap(self, other: PointCloud3) -> int:
+        """Count the points that are in both clouds."""
+        return int(np.isin(other.keys, self.keys, assume_unique=True).sum())
+
+    @cached_property
+    def span(self) -> tuple[P3D, P3D]:
+        """Bounding box: the lowest & highest coordinates."""
+        lo, hi = self.array.min(axis=0), self.array.max(axis=0)
+        return P3D(*lo.tolist()), P3D(*hi.tolist())
+
+    def moved(self, offset: P3D | NDArray[np.int64]) -> PointCloud3:
+        return PointCloud3.from_array(self.array + np.asarray(offset))
+
+    def rotated(self, rotation: Trans3) -> PointCloud3:
+        return PointCloud3.from_array(self.array @ rotation_matrix(rotation).T)
+
+    def rotations(self) -> Iterator[PointCloud3]:
+        """Rotate the cloud in all 24 ways (in the order of ROTATIONS_3D)."""
+        for rotated in np.einsum("rij,nj->rni", rotation_matrices(), self.array):
+            yield PointCloud3.from_array(rotated)
+
+    def transformed(self, pose: Pose3) -> PointCloud3:
+        rotation, offset = pose
+        return PointCloud3.from_array(self.array @ rotation.T + offset)
+
+
+class _Scan:
+    def __init__(self, points: PointCloud3) -> None:
+        self.cloud = points
+        array = points.array
+
+        # Squared distances between all pairs of points: a fingerprint that's the
+        # same however the points are rotated or moved.
+        diffs = array[:, None, :] - array[None, :, :]
+        i, j = np.triu_indices(len(array), k=1)
+        distances = (diffs**2).sum(axis=2)[i, j].tolist()
+        self.fingerprint = Counter(distances)
+        # Pairs of points that can be told apart by their distance alone
+        self.anchors = {
+            d: (a, b)
+            for d, a, b in zip(distances, i.tolist(), j.tolist(), strict=True)
+            if self.fingerprint[d] == 1
+        }
+
+    def common_distances(self, other: _Scan) -> int:
+        return (self.fingerprint & other.fingerprint).total()
+
+    def pose_of(self, other: _Scan, min_overlap: int) -> Pose3 | None:
+        """Pose that puts the other points in this frame, if enough of them overlap."""
+        rotations = rotation_matrices()
+        for d in self.anchors.keys() & other.anchors.keys():
+            p1, p2 = self.cloud.array[list(self.anchors[d])]
+            q1, q2 = (rotations @ q for q in other.cloud.array[list(other.anchors[d])])
+            # Try every rotation at once, for both ways to match up the anchors.
+            for r1, r2 in ((q1, q2), (q2, q1)):
+                offsets = p1 - r1
+                for i in np.flatnonzero((r2 + offsets == p2).all(axis=1)):
+                    pose = rotations[i], offsets[i]
+                    if self.cloud.overlap(other.cloud.transformed(pose)) >= min_overlap:
+                        return pose
+        return None
+
+
+def align_scans(scans: Sequence[PointCloud3], min_overlap: int = 12) -> list[Pose3]:
+    """
+    Pose of every scan (of points in its own frame), relative to the first one.
+
+    Scans that probably overlap are found by the distances between their points,
+    which don't depend on position or orientation. Starting at the first scan, the
+    unaligned scan sharing the most distances with an aligned one is aligned with
+    it next (building up a maximum spanning tree of poses).
+    """
+    scanned = [_Scan(scan) for scan in scans]
+    # Overlapping points have at least this many distances in common.
+    min_common = min_overlap * (min_overlap - 1) // 2
+    common = [[a.common_distances(b) for b in scanned] for a in scanned]
+    poses: dict[int, Pose3] = {}
+    # Candidate pairs (aligned scan i, unaligned scan j), most in common first.
+    candidates: list[tuple[int, int, int]] = []
+
+    def place(i: int, pose: Pose3) -> None:
+        poses[i] = pose
+        for j, c in enumerate(common[i]):
+            if j not in poses and c >= min_common:
+                heapq.heappush(candidates, (-c, i, j))
+
+    place(0, (np.eye(3, dtype=np.int64), np.zeros(3, np.int64)))
+    while candidates:
+        _, i, j = heapq.heappop(candidates)
+        if j in poses:
+            continue
+        if pose := scanned[i].pose_of(scanned[j], min_overlap):
+            rotation, offset = poses[i]
+            r, o = pose
+            place(j, (rotation @ r, rotation @ o + offset))
+
+    if len(poses) < len(scans):
+        raise ValueError(set(range(len(scans))) - poses.keys())
+    return [poses[i] for i in range(len(scans))]
@@ -0,0 +1,155 @@
+"""
+Shortest path searches through state spaces.
+
+States are plain (hashable & comparable) values, preferably ints or small tuples.
+No objects are created per state: a search only keeps track of the cost to reach
+every state, and from which state it was reached (to reconstruct a path with).
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING
+
+from based_utils.algo import NoPathFoundError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+type Neighbors[S] = Callable[[S], Iterable[S]]
+type WeightedNeighbors[S] = Callable[[S], Iterable[tuple[S, int]]]
+
+
+@dataclass(frozen=True)
+class SearchResult[S]:
+    end: S | None
+    # Lowest cost found to reach every state, and the state it was reached from.
+    costs: dict[S, int]
+    parents: dict[S, S | None]
+
+    @property
+    def length(self) -> int:
+        if self.end is None:
+            raise NoPathFoundError
+        return self.costs[self.end]
+
+    @property
+    def visited(self) -> Iterable[S]:
+        return self.costs.keys()
+
+    def path_to(self, state: S) -> Iterator[S]:
+        """Traverse back from the given state to the start."""
+        s: S | None = state
+        while s is not None:
+            yield s
+            s = self.parents[s]
+
+    @property
+    def states(self) -> list[S]:
+        """Complete path from start to end."""
+        if self.end is None:
+            raise NoPathFoundError
+        return list(self.path_to(self.end))[::-1]
+
+
+def bfs[S](
+    start: S, neighbors: Neighbors[S], is_end: Callable[[S], bool] = None
+) -> SearchResult[S]:
+    """
+    Breadth first search, for when every step costs the same.
+
+    Without is_end, all states reachable from the start are visited.
+
+    >>> r = bfs(1, lambda n: [n * 2, n + 3], lambda n: n == 11)
+    >>> r.length, r.states
+    (3, [1, 4, 8, 11])
+    >>> sorted(bfs(0, lambda n: [(n + 2) % 5]).visited)
+    [0, 1, 2, 3, 4]
+    """
+    costs: dict[S, int] = {start: 0}
+    parents: dict[S, S | None] = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if is_end and is_end(state):
+            return SearchResult(state, costs, parents)
+
+        cost = costs[state] + 1
+        for next_state in neighbors(state):
+            if next_state not in costs:
+                costs[next_state] = cost
+                parents[next_state] = state
+                queue.append(next_state)
+
+    if is_end:
+        raise NoPathFoundError
+    return SearchResult(None, costs, parents)
+
+
+def dijkstra[S](
+    start: S, neighbors: WeightedNeighbors[S], is_end: Callable[[S], bool] = None
+) -> SearchResult[S]:
+    """
+    Dijkstra's algorithm, for steps with different (non-negative) costs.
+
+    >>> steps = {"a": [("b", 1), ("c", 5)], "b": [("c", 1)], "c": [("a", 1)]}
+    >>> r = dijkstra("a", steps.__getitem__, lambda s: s == "c")
+    >>> r.length, r.states
+    (2, ['a', 'b', 'c'])
+    """
+    costs: dict[S, int] = {start: 0}
+    parents: dict[S, S | None] = {start: None}
+    queue = [(0, start)]
+    while queue:
+        cost, state = heappop(queue)
+        if cost > costs[state]:
+            # Reached this state in a cheaper way already.
+            continue
+        if is_end and is_end(state):
+            return SearchResult(state, costs, parents)
+
+        for next_state, step in neighbors(state):
+            next_cost = cost + step
+            old_cost = costs.get(next_state)
+            if old_cost is None or next_cost < old_cost:
+                costs[next_state] = next_cost
+                parents[next_state] = state
+                heappush(queue, (next_cost, next_state))
+
+    if is_end:
+        raise NoPathFoundError
+    return SearchResult(None, costs, parents)
+
+
+def a_star[S](
+    start: S,
+    neighbors: WeightedNeighbors[S],
+    is_end: Callable[[S], bool],
+    heuristic: Callable[[S], int],
+) -> SearchResult[S]:
+    """
+    Search like Dijkstra, guided by an estimate of the cost left to reach the end.
+
+    The heuristic should never overestimate that cost.
+    """
+    costs: dict[S, int] = {start: 0}
+    parents: dict[S, S | None] = {start: None}
+    queue = [(heuristic(start), 0, start)]
+    while queue:
+        _, cost, state = heappop(queue)
+        if cost > costs[state]:
+            continue
+        if is_end(state):
+            return SearchResult(state, costs, parents)
+
+        for next_state, step in neighbors(state):
+            next_cost = cost + step
+            old_cost = costs.get(next_state)
+            if old_cost is None or next_cost < old_cost:
+                costs[next_state] = next_cost
+                parents[next_state] = state
+                heappush(
+                    queue, (next_cost + heuristic(next_state), next_cost, next_state)
+                )
+
+    raise NoPathFoundError
@@ -3,7 +3,7 @@ from copy import copy
 from itertools import permutations
 from typing import TYPE_CHECKING
 
-from .intcode import IntcodeProblem
+from .intcode import IntcodeNetwork, IntcodeProblem
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -14,7 +14,7 @@ class _Problem(IntcodeProblem[int], ABC):
 
 
 class Problem1(_Problem):
-    test_solution = None
+    test_solution = 43210
     puzzle_solution = 34686
 
     def output_for(self, phase_settings: Iterable[int], input_: int = 0) -> int:
@@ -33,27 +33,22 @@ class Problem1(_Problem):
 
 
 class Problem2(_Problem):
-    test_solution = None
+    test_solution = 18216
     puzzle_solution = 36384144
 
     def feedback_output_for(self, phase_settings: Iterable[int]) -> int:
-        computers = [copy(self.computer) for _ in range(5)]
-        output = 0
-        states = {}
-        is_running = True
-        while is_running:
-            for computer, phase_setting in zip(computers, phase_settings, strict=True):
-                if computer in states:
-                    computer.inputs += [output]
-                else:
-                    states[computer] = computer.run_to_next_output(
-                        phase_setting, output
-                    )
-                try:
-                    output = next(states[computer])
-                except StopIteration:
-                    is_running = False
-        return output
+        network = IntcodeNetwork(copy(self.computer) for _ in range(5))
+        for address, phase_setting in enumerate(phase_settings):
+            network.send(address, phase_setting)
+        network.send(0, 0)
+        signal = 0
+        while not network.is_halted:
+            for address, outputs in network.run_round():
+                # Amplifier E feeds back into amplifier A.
+                network.send((address + 1) % 5, *outputs)
+                if address == 4:
+                    signal = outputs[-1]
+        return signal
 
     def solution(self) -> int:
         return max(
@@ -62,7 +57,9 @@ class Problem2(_Problem):
         )
 
 
-TEST_INPUT = (
+TEST_INPUT_1 = "3,15,3,16,1002,16,10,16,1,16,15,15,4,15,99,0,0"
+
+TEST_INPUT_2 = (
     "3,52,1001,52,-5,52,3,53,1,52,56,54,1007,54,5,55,1005,55,26,1001,54,-5,54,1105,1,12,1,53,"
     "54,53,1008,54,0,55,1001,55,1,55,2,53,55,53,4,53,1001,56,-1,56,1005,56,6,99,0,0,0,0,10"
 )
@@ -0,0 +1,95 @@
+from abc import ABC
+from collections import deque
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from advent_of_code.utils.geo2d import DOWN, LEFT, RIGHT, UP, neighbors_2
+
+from .intcode import IntcodeProblem
+
+if TYPE_CHECKING:
+    from advent_of_code.utils.geo2d import P2
+
+    from .intcode import IntcodeComputer
+
+# Movement commands 1-4
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
+
+
+class Status(IntEnum):
+    WALL = 0
+    MOVED = 1
+    FOUND = 2
+
+
+def explore(droid: IntcodeComputer) -> tuple[dict[P2, int], P2 | None]:
+    """
+    Map out the area the droid can reach, breadth first.
+
+    Instead of walking the droid back and forth, it's forked at every position
+    it reaches, so each branch only needs to take a single step.
+    Returns the distance to every open position and where the oxygen system is.
+    """
+    distances, oxygen_system = {(0, 0): 0}, None
+    queue = deque([((0, 0), droid)])
+    while queue:
+        (x, y), droid = queue.popleft()
+        for command, (dx, dy) in enumerate(DIRECTIONS, 1):
+            pos = x + dx, y + dy
+            if pos in distances:
+                continue
+            branch = droid.fork()
+            branch.inputs.append(command)
+            status = branch.next_output()
+            if status == Status.WALL:
+                continue
+            distances[pos] = distances[x, y] + 1
+            if status == Status.FOUND:
+                oxygen_system = pos
+            queue.append((pos, branch))
+    return distances, oxygen_system
+
+
+class _Problem(IntcodeProblem[int], ABC):
+    def __init__(self) -> None:
+        self.distances, oxygen_system = explore(self.computer)
+        assert oxygen_system
+        self.oxygen_system = oxygen_system
+
+
+class Problem1(_Problem):
+    test_solution = 3
+    puzzle_solution = None
+
+    def solution(self) -> int:
+        return self.distances[self.oxygen_system]
+
+
+class Problem2(_Problem):
+    test_solution = 4
+    puzzle_solution = None
+
+    def solution(self) -> int:
+        filled, edge, minutes = set(), {self.oxygen_system}, -1
+        while edge:
+            filled |= edge
+            edge = {n for p in edge for n in neighbors_2(p, self.distances)} - filled
+            minutes += 1
+        return minutes
+
+
+# A droid (starting at D) in the example area of part 2:
+#
+#  ##
+# #..##
+# #.#.D#
+# #.O.#
+#  ###
+#
+# It reads a movement command, looks up the area at its next position, outputs that
+# and moves there (unless it's a wall), forever.
+TEST_INPUT = (
+    "3,30,1001,30,33,8,1,31,0,32,1001,32,38,15,1001,0,0,33,4,33,1006,33,0,1001,32,0,"
+    "31,1106,0,0,0,16,0,0,-6,6,-1,1,0,0,0,0,0,0,0,1,1,0,0,0,0,1,0,1,1,0,0,1,2,1,0,0,"
+    "0,0,0,0,0,0"
+)
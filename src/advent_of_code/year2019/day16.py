@@ -35,6 +35,7 @@ class Problem1(_Problem):
 class Problem2(_Problem):
     test_solution = 84462026
     puzzle_solution = None
+    is_unfinished = True
 
     def solution(self) -> int:
         return 0
@@ -59,15 +59,16 @@ class Problem2(Problem1):
         runner = self.computer.run_to_next_output()
 
         # stage 1: Constructed path from first output
-        processed = process_output(runner)
-        log.lazy_debug(lambda: CharGrid2(processed).to_lines())
+        # (the map is always read, only after that does the robot take its routine)
+        grid = CharGrid2(process_output(runner))
+        log.lazy_debug(grid.to_lines)
 
         # Stage 2: Patterns derived manually after looking at path
-        self.computer.inputs = [
+        self.computer.inputs.extend(
             ord(c)
             for s in ["ABACABCCAB", "R8L55R8", "R66R8L8L66", "L66L55L8", "n"]
             for c in ",".join(s) + "\n"
-        ]
+        )
         return last(runner)
 
 
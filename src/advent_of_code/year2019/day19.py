@@ -10,6 +10,7 @@ class _Problem(IntcodeProblem[int], ABC):
 class Problem1(_Problem):
     test_solution = 27
     puzzle_solution = 126
+    is_unfinished = True
 
     def solution(self) -> int:
         return 0
@@ -18,6 +19,7 @@ class Problem1(_Problem):
 class Problem2(_Problem):
     test_solution = 250020
     puzzle_solution = None
+    is_unfinished = True
 
     def solution(self) -> int:
         return 0
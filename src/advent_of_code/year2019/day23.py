@@ -0,0 +1,78 @@
+from abc import ABC
+from copy import copy
+from itertools import batched
+from typing import TYPE_CHECKING
+
+from more_itertools import last
+
+from advent_of_code.problems import NoSolutionFoundError
+
+from .intcode import IntcodeNetwork, IntcodeProblem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from advent_of_code.utils.geo2d import P2
+
+NAT = 255
+
+
+class _Problem(IntcodeProblem[int], ABC):
+    def __init__(self) -> None:
+        self.network = IntcodeNetwork(
+            (copy(self.computer) for _ in range(50)), idle_input=-1
+        )
+        for address in range(50):
+            self.network.send(address, address)
+
+    def packets_to_nat(self) -> Iterator[P2]:
+        """Deliver the packets sent in a round, except for the ones sent to the NAT."""
+        for _, outputs in self.network.run_round():
+            for address, x, y in batched(outputs, 3, strict=True):
+                if address == NAT:
+                    yield x, y
+                else:
+                    self.network.send(address, x, y)
+
+
+class Problem1(_Problem):
+    test_solution = 3
+    puzzle_solution = None
+
+    def solution(self) -> int:
+        while not self.network.is_idle:
+            for _x, y in self.packets_to_nat():
+                return y
+        # Nothing will happen anymore.
+        raise NoSolutionFoundError
+
+
+class Problem2(_Problem):
+    test_solution = 6
+    puzzle_solution = None
+
+    def solution(self) -> int:
+        packet, last_y = None, None
+        while True:
+            # The NAT only remembers the last packet it received.
+            packet = last(self.packets_to_nat(), default=packet)
+            if not self.network.is_idle:
+                continue
+            if not packet:
+                # Nothing will happen anymore.
+                raise NoSolutionFoundError
+            x, y = packet
+            if y == last_y:
+                return y
+            self.network.send(0, x, y)
+            last_y = y
+
+
+# Computer 0 sends a packet (3, 0) to computer 1, which passes it on to computer 2,
+# and so on. Computer 49 sends (X, Y) on to the NAT as (max(X - 1, 0), Y + X), so
+# the NAT sends (2, 3), (1, 5), (0, 6) and (0, 6) to computer 0.
+TEST_INPUT = (
+    "3,71,1008,71,0,74,1006,74,15,104,1,104,3,104,0,3,72,1008,72,-1,74,1005,74,15,3,"
+    "73,1008,71,49,74,1005,74,46,1001,71,1,75,4,75,4,72,4,73,1105,1,15,1,73,72,73,"
+    "107,0,72,74,1002,74,-1,74,1,72,74,72,104,255,4,72,4,73,1105,1,15,0,0,0,0,0"
+)
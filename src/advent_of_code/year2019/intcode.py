@@ -1,4 +1,5 @@
 from abc import ABC
+from collections import deque
 from enum import IntEnum
 from typing import TYPE_CHECKING
 
@@ -7,7 +8,7 @@ from more_itertools import last
 from advent_of_code.problems import OneLineProblem
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
 
 
 class ParamMode(IntEnum):
@@ -29,139 +30,256 @@ class OpCode(IntEnum):
     STOP = 99
 
 
-class StopError(Exception):
-    pass
+type _Modes = tuple[ParamMode, ParamMode, ParamMode]
+type _Instruction = tuple[OpCode, _Modes]
 
+# Operations that store their result, with the (index of the) parameter that holds
+# the address to store it at.
+_WRITE_PARAMS = {OpCode.ADD: 2, OpCode.MUL: 2, OpCode.IN: 0, OpCode.LT: 2, OpCode.EQ: 2}
+
+# Instructions decoded so far, keyed by their value in memory.
+# Caching by value rather than by address keeps self-modifying programs working.
+_decoded: dict[int, _Instruction] = {}
 
-instruction_lengths = {
-    OpCode.ADD: 3,
-    OpCode.MUL: 3,
-    OpCode.IN: 1,
-    OpCode.OUT: 1,
-    OpCode.JT: 2,
-    OpCode.JF: 2,
-    OpCode.LT: 3,
-    OpCode.EQ: 3,
-    OpCode.REL: 1,
+
+def _decode(value: int) -> _Instruction:
+    """
+    Split an instruction into its op code and parameter modes.
+
+    >>> op_code, param_modes = _decode(1002)
+    >>> op_code.name, [mode.name for mode in param_modes]
+    ('MUL', ['POSITION', 'IMMEDIATE', 'POSITION'])
+    """
+    try:
+        return _decoded[value]
+    except KeyError:
+        pass
+
+    modes, op = divmod(value, 100)
+    op_code = OpCode(op)
+    param_modes = (
+        ParamMode(modes % 10),
+        ParamMode(modes // 10 % 10),
+        ParamMode(modes // 100 % 10),
+    )
+    i = _WRITE_PARAMS.get(op_code)
+    if i is not None and param_modes[i] == ParamMode.IMMEDIATE:
+        raise ValueError(param_modes[i])
+
+    _decoded[value] = op_code, param_modes
+    return op_code, param_modes
+
+
+def _address(memory: list[int], pointer: int, mode: int, relative_base: int) -> int:
+    """Address the parameter at the given pointer refers to."""
+    if mode == ParamMode.IMMEDIATE:
+        return pointer
+
+    address = memory[pointer]
+    if mode == ParamMode.RELATIVE:
+        address += relative_base
+
+    if address >= len(memory):
+        # Extend memory so it can be read from / written to at the given address.
+        # Fill up the addresses in between with zeros.
+        memory += [0] * (address + 1 - len(memory))
+    elif address < 0:
+        raise IndexError(address)
+
+    return address
+
+
+def _add(memory: list[int], ptr: int, rb: int, modes: _Modes) -> int:
+    m1, m2, m3 = modes
+    memory[_address(memory, ptr + 3, m3, rb)] = (
+        memory[_address(memory, ptr + 1, m1, rb)]
+        + memory[_address(memory, ptr + 2, m2, rb)]
+    )
+    return ptr + 4
+
+
+def _mul(memory: list[int], ptr: int, rb: int, modes: _Modes) -> int:
+    m1, m2, m3 = modes
+    memory[_address(memory, ptr + 3, m3, rb)] = (
+        memory[_address(memory, ptr + 1, m1, rb)]
+        * memory[_address(memory, ptr + 2, m2, rb)]
+    )
+    return ptr + 4
+
+
+def _lt(memory: list[int], ptr: int, rb: int, modes: _Modes) -> int:
+    m1, m2, m3 = modes
+    memory[_address(memory, ptr + 3, m3, rb)] = int(
+        memory[_address(memory, ptr + 1, m1, rb)]
+        < memory[_address(memory, ptr + 2, m2, rb)]
+    )
+    return ptr + 4
+
+
+def _eq(memory: list[int], ptr: int, rb: int, modes: _Modes) -> int:
+    m1, m2, m3 = modes
+    memory[_address(memory, ptr + 3, m3, rb)] = int(
+        memory[_address(memory, ptr + 1, m1, rb)]
+        == memory[_address(memory, ptr + 2, m2, rb)]
+    )
+    return ptr + 4
+
+
+def _jt(memory: list[int], ptr: int, rb: int, modes: _Modes) -> int:
+    m1, m2, _ = modes
+    if memory[_address(memory, ptr + 1, m1, rb)]:
+        return memory[_address(memory, ptr + 2, m2, rb)]
+    return ptr + 3
+
+
+def _jf(memory: list[int], ptr: int, rb: int, modes: _Modes) -> int:
+    m1, m2, _ = modes
+    if memory[_address(memory, ptr + 1, m1, rb)]:
+        return ptr + 3
+    return memory[_address(memory, ptr + 2, m2, rb)]
+
+
+# Instructions that only touch memory and the instruction pointer.
+# The others (I/O, relative base & stop) are handled by the computer itself.
+_handlers: dict[int, Callable[[list[int], int, int, _Modes], int]] = {
+    OpCode.ADD: _add,
+    OpCode.MUL: _mul,
+    OpCode.JT: _jt,
+    OpCode.JF: _jf,
+    OpCode.LT: _lt,
+    OpCode.EQ: _eq,
 }
 
 
 class IntcodeComputer:
     def __init__(self, program: Iterable[int]) -> None:
         self.program = list(program)
-        self.memory: list[int] = []
-        self.inputs: list[int] = []
-        self._relative_base = 0
+        self.reset()
 
     @classmethod
     def from_str(cls, s: str) -> IntcodeComputer:
         return cls(int(c) for c in s.split(","))
 
+    def reset(self, *input_: int) -> None:
+        """Load the program, to run it from the start with the given input."""
+        self.memory = self.program[:]
+        self.pointer = 0
+        self.relative_base = 0
+        self.inputs = deque(input_)
+
+    def fork(self) -> IntcodeComputer:
+        """Copy of the computer (in its current state) that runs independently."""
+        forked = IntcodeComputer(self.program)
+        forked.memory = self.memory[:]
+        forked.pointer = self.pointer
+        forked.relative_base = self.relative_base
+        forked.inputs = self.inputs.copy()
+        return forked
+
     def __copy__(self) -> IntcodeComputer:
-        return IntcodeComputer(self.program)
-
-    def _read(self, address: int, param_mode: ParamMode) -> int:
-        if param_mode == ParamMode.IMMEDIATE:
-            return address
-        if param_mode == ParamMode.RELATIVE:
-            address = self._relative_base + address
-
-        if address < 0:
-            raise IndexError(address)
-
-        try:
-            return self.memory[address]
-        except IndexError:
-            return 0
-
-    def _write(self, address: int, value: int, param_mode: ParamMode) -> None:
-        if param_mode == ParamMode.IMMEDIATE:
-            raise ValueError(param_mode)
-        if param_mode == ParamMode.RELATIVE:
-            address = self._relative_base + address
-
-        if address < 0:
-            raise IndexError(address)
-
-        try:
-            self.memory[address] = value
-        except IndexError:
-            # Extend memory so it can store the value at the given address.
-            # Fill up the addresses in between with zeros.
-            self.memory += [0] * (address - len(self.memory)) + [value]
-
-    def _execute_next_instruction(self, ptr: int) -> tuple[int, int | None]:
+        return self.fork()
+
+    @property
+    def is_halted(self) -> bool:
+        return (
+            self.pointer >= len(self.memory) or self.memory[self.pointer] == OpCode.STOP
+        )
+
+    def next_output(self) -> int | None:
+        """
+        Continue running the program until it outputs something.
+
+        Returns None if the program halts, or when it needs input that isn't there.
+        In the latter case it can be resumed after providing more input.
+        """
+        # Hot loop: keep everything needed in local variables.
+        memory, inputs = self.memory, self.inputs
+        pointer, relative_base = self.pointer, self.relative_base
+        handlers, decode, address = _handlers, _decode, _address
         output = None
-        op_code_str = f"{self.memory[ptr]:05d}"
-        op_code = OpCode(int(op_code_str[-2:]))
-        param_modes = [ParamMode(int(c)) for c in reversed(op_code_str[:-2])]
-
-        if op_code == OpCode.STOP:
-            raise StopError
+        while pointer < len(memory):
+            op_code, modes = decode(memory[pointer])
 
-        num_params = instruction_lengths[op_code]
-        pointer = ptr + 1
-        params = self.memory[pointer : pointer + num_params]
+            if handler := handlers.get(op_code):
+                pointer = handler(memory, pointer, relative_base, modes)
+                continue
 
-        if num_params == 1:
-            param, *_ = params
-            param_mode, *_ = param_modes
+            if op_code == OpCode.STOP or (op_code == OpCode.IN and not inputs):
+                break
 
+            param = address(memory, pointer + 1, modes[0], relative_base)
+            pointer += 2
             if op_code == OpCode.IN:
-                self._write(param, self.inputs.pop(0), param_mode)
-
+                memory[param] = inputs.popleft()
             elif op_code == OpCode.OUT:
-                output = self._read(param, param_mode)
-
+                output = memory[param]
+                break
             else:  # op_code == OpCode.REL
-                self._relative_base += self._read(param, param_mode)
-
-        elif num_params == 2:
-            param, new_ip = params
-            param_mode1, param_mode2, *_ = param_modes
-            param = self._read(param, param_mode1)
-            new_pointer = self._read(new_ip, param_mode2)
-
-            if (op_code == OpCode.JT and param) or (op_code == OpCode.JF and not param):
-                return new_pointer, output
-
-        else:  # num_params == 3:
-            op1, op2, to_address = params
-            param_mode1, param_mode2, param_mode3 = param_modes
-            op1 = self._read(op1, param_mode1)
-            op2 = self._read(op2, param_mode2)
-
-            self._write(
-                to_address,
-                {
-                    OpCode.ADD: op1 + op2,
-                    OpCode.MUL: op1 * op2,
-                    OpCode.LT: int(op1 < op2),
-                    OpCode.EQ: int(op1 == op2),
-                }[OpCode(op_code)],
-                param_mode3,
-            )
-
-        return pointer + num_params, output
+                relative_base += memory[param]
 
-    def run_to_next_output(self, *input_: int) -> Iterator[int]:
-        self.inputs = list(input_)
-        self.memory = self.program[:]
+        self.pointer, self.relative_base = pointer, relative_base
+        return output
 
-        pointer = 0
-        while pointer < len(self.memory):
-            try:
-                pointer, output = self._execute_next_instruction(pointer)
-            except StopError:
-                break
-            if output is None:
-                continue
+    def run_to_next_output(self, *input_: int) -> Iterator[int]:
+        self.reset(*input_)
+        # Inputs can be added (or replaced) in between outputs.
+        while (output := self.next_output()) is not None:
             yield output
+        if not self.is_halted:
+            raise EOFError(self.pointer)
 
     def run(self, *input_: int) -> int:
         return last(self.run_to_next_output(*input_), default=0)
 
 
+class IntcodeNetwork:
+    """
+    Computers that run cooperatively, passing values to each other.
+
+    Each computer in turn runs until it needs input that isn't there yet (or halts),
+    after which its output can be sent on to others.
+    Optionally, computers waiting for input get a default value instead, after
+    which they get to run until they need input again.
+    """
+
+    def __init__(
+        self, computers: Iterable[IntcodeComputer], *, idle_input: int = None
+    ) -> None:
+        self.computers = list(computers)
+        self.idle_input = idle_input
+        self.is_idle = False
+
+    def send(self, address: int, *values: int) -> None:
+        self.computers[address].inputs.extend(values)
+
+    @property
+    def is_halted(self) -> bool:
+        return all(computer.is_halted for computer in self.computers)
+
+    def _run_turn(self, computer: IntcodeComputer) -> list[int]:
+        if self.idle_input is not None and not computer.inputs:
+            computer.inputs.append(self.idle_input)
+        outputs = []
+        while (output := computer.next_output()) is not None:
+            outputs.append(output)
+        return outputs
+
+    def run_round(self) -> list[tuple[int, list[int]]]:
+        """
+        Give every computer that's still running a turn.
+
+        Returns the output of every computer (by address) that had any.
+        The network is idle when there was none and nothing is left to be received.
+        """
+        outputs = [
+            (address, output)
+            for address, computer in enumerate(self.computers)
+            if not computer.is_halted and (output := self._run_turn(computer))
+        ]
+        self.is_idle = not outputs and not any(c.inputs for c in self.computers)
+        return outputs
+
+
 class IntcodeProblem[T](OneLineProblem[T], ABC):
     computer: IntcodeComputer
 
@@ -1,74 +1,70 @@
 from abc import ABC
-from dataclasses import dataclass
+from itertools import product
 from typing import TYPE_CHECKING
 
 from advent_of_code import log
-from advent_of_code.problems import MultiLineProblem
+from advent_of_code.problems import NumGridProblem
+from advent_of_code.utils.geo2d import all_directions
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
-octopi: dict[tuple[int, int], Octopus] = {}
 
+class Octopi:
+    """Energy levels of a rectangle of octopi, in a flat list (row by row)."""
+
+    def __init__(self, rows: list[list[int]]) -> None:
+        self.width, self.height = len(rows[0]), len(rows)
+        self.energy = [e for row in rows for e in row]
+        self.neighbors = [
+            [
+                ny * self.width + nx
+                for dx, dy in all_directions
+                if 0 <= (nx := x + dx) < self.width
+                and 0 <= (ny := y + dy) < self.height
+            ]
+            for y, x in product(range(self.height), range(self.width))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.energy)
+
+    def step(self) -> int:
+        """Let all octopi gain energy and flash, returns the number of flashes."""
+        energy, neighbors = self.energy, self.neighbors
+        for i in range(len(energy)):
+            energy[i] += 1
+        flashing = [i for i, e in enumerate(energy) if e > 9]
+        flashes = 0
+        while flashing:
+            i = flashing.pop()
+            flashes += 1
+            energy[i] = 0
+            for n in neighbors[i]:
+                # Octopi that flashed already (at 0) don't gain energy anymore.
+                if energy[n] and energy[n] <= 9:
+                    energy[n] += 1
+                    if energy[n] > 9:
+                        flashing.append(n)
+        return flashes
 
-@dataclass
-class Octopus:
-    energy: int
-    x: int
-    y: int
-
-    def check_flash(self) -> None:
-        if self.energy <= 9:
-            return
-        # flash!
-        self.energy = 0
-
-        # boost neighbors that haven't flashed
-        for i in -1, 0, 1:
-            for j in -1, 0, 1:
-                x, y = self.x + i, self.y + j
-                if (x, y) not in octopi:
-                    # skip edge lords
-                    continue
-
-                octopus = octopi[x, y]
-                if not octopus.energy:
-                    # skip already flashed
-                    continue
-
-                # boost neighbor
-                octopus.energy += 1
-                octopus.check_flash()
-
-
-def octopus_str(x: int, y: int) -> str:
-    return f"{octopi[x, y].energy} " if octopi[x, y].energy else "💩"
-
+    def to_lines(self) -> Iterator[str]:
+        for y in range(self.height):
+            row = self.energy[y * self.width : (y + 1) * self.width]
+            yield " ".join(f"{e} " if e else "💩" for e in row)
 
-class _Problem(MultiLineProblem[int], ABC):
-    def octopi_str(self) -> Iterator[str]:
-        size = len(self.lines[0])
-        for y in range(size):
-            yield " ".join(octopus_str(x, y) for x in range(size))
 
+class _Problem(NumGridProblem[int], ABC):
     def assignment(self, max_steps: int = None) -> list[int]:
-        for y, line in enumerate(self.lines):
-            for x, energy in enumerate(line):
-                octopi[x, y] = Octopus(int(energy), x, y)
-
+        octopi = Octopi(list(self.grid.rows))
         flashes = []
         steps = 0
         while not max_steps or steps < max_steps:
             steps += 1
 
-            log.lazy_debug(self.octopi_str)
-
-            for octopus in octopi.values():
-                octopus.energy += 1
-            for octopus in octopi.values():
-                octopus.check_flash()
+            log.lazy_debug(octopi.to_lines)
 
-            step_flashes = len([o for o in octopi.values() if not o.energy])
+            step_flashes = octopi.step()
             flashes.append(step_flashes)
             if step_flashes == len(octopi):
                 break
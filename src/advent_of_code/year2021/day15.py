@@ -1,68 +1,35 @@
-from typing import TYPE_CHECKING, NamedTuple
-
-from based_utils.algo import DijkstraState
 from based_utils.math import mods
 
 from advent_of_code import log
 from advent_of_code.problems import NumGridProblem
-from advent_of_code.utils.geo2d import P2, NumGrid2
-
-if TYPE_CHECKING:
-    from collections.abc import Iterator
-
-
-class Constants:
-    def __init__(self, cave: NumGrid2) -> None:
-        self.cave = cave
-        _, self.end_position = cave.span
-
-
-class Variables(NamedTuple):
-    position: P2 = 0, 0
-
-
-class ChitonState(DijkstraState[Constants, Variables]):
-    @property
-    def is_end_state(self) -> bool:
-        return self.v.position == self.c.end_position
-
-    @property
-    def next_states(self) -> Iterator[ChitonState]:
-        for pos, dist in self.c.cave.neighbors(self.v.position):
-            yield self.move(Variables(pos), distance=dist)
+from advent_of_code.utils.grid_search import GridGraph
 
 
 class Problem1(NumGridProblem[int]):
     test_solution = 40
     puzzle_solution = 583
+    cache_input = True
 
-    def solution(self) -> int:
-        path = ChitonState.find_path(Variables(), Constants(self.grid))
-        log.lazy_debug(
-            lambda: self.grid.to_lines(highlighted={s.v.position for s in path.states})
-        )
+    def lowest_total_risk(self, cave: GridGraph) -> int:
+        x, y = cave.origin
+        w, h = cave.size
+        path = cave.dijkstra((x, y), (x + w - 1, y + h - 1))
+        log.lazy_debug(lambda: self.grid.to_lines(highlighted=set(path.path)))
         return path.length
 
+    def solution(self) -> int:
+        return self.lowest_total_risk(GridGraph.from_grid(self.grid))
+
 
 class Problem2(Problem1):
     test_solution = 315
     puzzle_solution = 2927
 
     def solution(self) -> int:
-        w, h = self.grid.size
-        grid = NumGrid2(
-            {
-                (x + w * i, y + h * j): mods(risk + i + j, 9, 1)
-                for i in range(5)
-                for j in range(5)
-                for (x, y), risk in self.grid.items()
-            }
-        )
-        path = ChitonState.find_path(Variables(), Constants(grid))
-        log.lazy_debug(
-            lambda: grid.to_lines(highlighted={s.v.position for s in path.states})
+        cave = GridGraph.from_grid(self.grid).tiled(
+            (5, 5), lambda risk, tile: mods(risk + sum(tile), 9, 1)
         )
-        return path.length
+        return self.lowest_total_risk(cave)
 
 
 TEST_INPUT = """
@@ -1,56 +1,36 @@
 from abc import ABC
-from typing import TYPE_CHECKING
 
 from based_utils.iterators import split_items
 from parse import parse  # type: ignore[import-untyped]
 
 from advent_of_code import log
-from advent_of_code.problems import MultiLineProblem
-from advent_of_code.utils.geo3d import P3D, ROTATIONS_3D
-
-if TYPE_CHECKING:
-    from collections.abc import Set
+from advent_of_code.problems import MultiLineProblem, shared_property
+from advent_of_code.utils.geo3d import P3D
+from advent_of_code.utils.point_clouds import PointCloud3, align_scans
 
 
 class _Problem(MultiLineProblem[int], ABC):
-    _scanners: list[set[P3D]]
-    beacons: set[P3D]
-    offsets: list[P3D]
+    cache_input = True
 
-    def __init__(self) -> None:
-        scanners = [
-            {P3D(*parse("{:d},{:d},{:d}", p)) for p in points[1:]}
+    @shared_property
+    def scanners(self) -> list[PointCloud3]:
+        return [
+            PointCloud3(P3D(*parse("{:d},{:d},{:d}", p)) for p in points[1:])
             for points in split_items(self.lines, delimiter="")
         ]
-        self.beacons, *self._scanners = scanners
-        self.offsets = []
-
-    def find_beacons(self) -> None:
-        unmatched = self._scanners[:]
-        while unmatched:
-            log.debug(f"Scanners left: {len(unmatched)}")
-            unmatched = [
-                scanner for scanner in unmatched if not self._match_beacons(scanner)
-            ]
-
-    def _match_beacons(self, scanner: Set[P3D]) -> bool:
-        for rotation in ROTATIONS_3D:
-            rotated_beacons: set[P3D] = {p.transform(rotation) for p in self.beacons}
-            for p_beacon in rotated_beacons:
-                for p_scanner in scanner:
-                    # move scanner points such that p0 and p1 overlap and check
-                    # if at least 12 scanner points overlap with beacons
-                    offset = p_scanner - p_beacon
-                    moved = {(p - offset) for p in scanner}
-                    if len(rotated_beacons & moved) < 12:
-                        continue
-                    # bingo
-                    inverse_rotation = ~rotation
-                    self.offsets.append(offset.transform(inverse_rotation))
-                    self.beacons |= {p.transform(inverse_rotation) for p in moved}
-                    log.debug(f"{len(self.beacons)} {rotation} {offset}")
-                    return True
-        return False
+
+    @shared_property
+    def poses(self) -> list[tuple[PointCloud3, P3D]]:
+        """Beacons detected by every scanner & its position, relative to the first."""
+        poses = []
+        for beacons, pose in zip(
+            self.scanners, align_scans(self.scanners), strict=True
+        ):
+            _, offset = pose
+            position = P3D(*offset.tolist())
+            log.debug(f"Scanner at {position}")
+            poses.append((beacons.transformed(pose), position))
+        return poses
 
 
 class Problem1(_Problem):
@@ -58,8 +38,10 @@ class Problem1(_Problem):
     puzzle_solution = 408
 
     def solution(self) -> int:
-        self.find_beacons()
-        return len(self.beacons)
+        all_beacons, *_ = self.poses[0]
+        for beacons, _ in self.poses[1:]:
+            all_beacons |= beacons
+        return len(all_beacons)
 
 
 class Problem2(_Problem):
@@ -67,13 +49,8 @@ class Problem2(_Problem):
     puzzle_solution = 13348
 
     def solution(self) -> int:
-        self.find_beacons()
-        return max(
-            p >> q
-            for i, p in enumerate(self.offsets)
-            for j, q in enumerate(self.offsets)
-            if i != j
-        )
+        positions = [position for _, position in self.poses]
+        return max(p >> q for p in positions for q in positions)
 
 
 TEST_INPUT = """
@@ -1,63 +1,25 @@
 from abc import ABC
-from dataclasses import dataclass
 
 from advent_of_code.problems import ParsedProblem
-from advent_of_code.utils.geo3d import P3D, Span3D
+from advent_of_code.utils.geo3d import P3D, Span3D, volume_switched_on
 
 
-@dataclass
-class Cuboid:
-    span: Span3D
-    state: int = 1
+def __parse_state(s: str) -> bool:
+    return s == "on"
 
-    @property
-    def volume(self) -> int:
-        return self.span.volume * self.state
 
-    def __and__(self, other: Cuboid) -> Cuboid:
-        return Cuboid(self.span & other.span, -other.state)
-
-    def __bool__(self) -> bool:
-        return self.volume != 0
-
-
-def __parse_state(s: str) -> int:
-    return 1 if s == "on" else 0
-
-
-class _Problem(ParsedProblem[tuple[int, int, int, int, int, int, int], int], ABC):
+class _Problem(ParsedProblem[tuple[bool, int, int, int, int, int, int], int], ABC):
     line_pattern = "{:state} x={:d}..{:d},y={:d}..{:d},z={:d}..{:d}"
+    cache_input = True
 
     def __init__(self) -> None:
-        self.cuboids = [
-            Cuboid(Span3D(P3D(x1, y1, z1), P3D(x2, y2, z2)), s)
-            for s, x1, x2, y1, y2, z1, z2 in self.parsed_input
+        self.steps = [
+            (Span3D(P3D(x1, y1, z1), P3D(x2, y2, z2)), on)
+            for on, x1, x2, y1, y2, z1, z2 in self.iter_parsed()
         ]
 
     def count_on_states(self) -> int:
-        cuboids: list[Cuboid] = []
-        for cuboid in self.cuboids:
-            cuboids += [intersection for c in cuboids if (intersection := cuboid & c)]
-            if cuboid.state == 1:
-                cuboids.append(cuboid)
-        return sum(cube.volume for cube in cuboids)
-        #     grid = {}
-        #     for line in input_lines:
-        #         state = line.startswith('on')
-        #         (x_min, x_max), (y_min, y_max), (z_min, z_max) = [
-        #             (int(a), int(b))
-        #             for a, b in
-        #             re.findall(r'[xyz]=(-?\d+)..(-?\d+)', line)
-        #         ]
-        #         if x_min < -50:
-        #             break
-        #         grid.update({c: state for c in {
-        #             (x, y, z)
-        #             for x in range(x_min, x_max + 1)
-        #             for y in range(y_min, y_max + 1)
-        #             for z in range(z_min, z_max + 1)
-        #         }})
-        #     return sum(grid.values())
+        return volume_switched_on(self.steps)
 
 
 class Problem1(_Problem):
@@ -67,7 +29,7 @@ class Problem1(_Problem):
     def __init__(self) -> None:
         super().__init__()
         problem_space = Span3D(P3D(-50, -50, -50), P3D(50, 50, 50))
-        self.cuboids = [c for c in self.cuboids if c.span in problem_space]
+        self.steps = [(c, on) for c, on in self.steps if c in problem_space]
 
     def solution(self) -> int:
         return self.count_on_states()
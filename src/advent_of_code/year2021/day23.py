@@ -1,111 +1,62 @@
 from abc import ABC, abstractmethod
-from collections.abc import Hashable
-from copy import copy
-from dataclasses import dataclass, field
 from functools import cached_property
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING
 
-from based_utils.algo import DijkstraState
 from kleur import Highlighter
 from ternimator import AnimParams
 
 from advent_of_code import C, log
 from advent_of_code.problems import MultiLineProblem
 from advent_of_code.utils import lowlighted, upper_to_num
+from advent_of_code.utils.search import dijkstra
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+type Room = tuple[int, ...]
 
-@dataclass
-class Room(Hashable):
-    _amphipod_type: int
-    _size: int
-    _content: list[int]
+# Content of every room (from the bottom up) and of the hallway (0 being empty).
+# Room r is meant for amphipods of type r + 1.
+type Burrow = tuple[tuple[Room, ...], tuple[int, ...]]
 
-    def __repr__(self) -> str:
-        return f"{self._content}"
+EMPTY_HALLWAY: tuple[int, ...] = (0,) * 7
 
-    def __hash__(self) -> int:
-        return hash((self._amphipod_type, self._size, *self._content))
 
-    def __copy__(self) -> Room:
-        return Room(self._amphipod_type, self._size, self._content[:])
+def _is_clean(r: int, room: Room) -> bool:
+    return all(amphipod == r + 1 for amphipod in room)
 
-    @property
-    def first(self) -> int:
-        return self._content[-1]
-
-    def get(self, i: int) -> int:
-        try:
-            return self._content[i]
-        except IndexError:
-            return 0
-
-    @property
-    def is_clean(self) -> bool:
-        return all(amphipod == self._amphipod_type for amphipod in self._content)
-
-    @property
-    def is_empty(self) -> bool:
-        return not self._content
-
-    @property
-    def is_full(self) -> bool:
-        return len(self._content) == self._size
-
-    @property
-    def spots_left(self) -> int:
-        return self._size - len(self._content)
-
-    def can_add(self, amphipod: int) -> bool:
-        return amphipod == self._amphipod_type and not self.is_full and self.is_clean
-
-    def add(self, amphipod: int) -> None:
-        self._content.append(amphipod)
-
-    def remove(self) -> int:
-        return self._content.pop()
 
+def _can_move(room: int, hall: int, hallway: tuple[int, ...]) -> bool:
+    # Trust me, I'm an engineer
+    return not (
+        (hall < room + 1 and any(hallway[hall + 1 : room + 2]))
+        or (hall > room + 2 and any(hallway[room + 2 : hall]))
+    )
 
-class Constants(NamedTuple):
-    room_size: int
 
+class Amphipods:
+    def __init__(self, room_size: int) -> None:
+        self.room_size = room_size
 
-@dataclass
-class Variables(Hashable):
-    rooms: list[Room]
-    hallway: list[int] = field(default_factory=lambda: [0] * 7)
-
-    def __hash__(self) -> int:
-        return hash((*[hash(r) for r in self.rooms], *self.hallway))
-
-
-class AmphipodState(DijkstraState[Constants, Variables]):
-    def __hash__(self) -> int:
-        return hash(f"{self.v.rooms}{self.v.hallway}")
-
-    @property
-    def is_end_state(self) -> bool:
-        return bool(self.cost and not sum(self.v.hallway))
-
-    def _can_move(self, room: int, hall: int) -> bool:
-        # Trust me, I'm an engineer
-        return not (
-            (hall < room + 1 and any(self.v.hallway[hall + 1 : room + 2]))
-            or (hall > room + 2 and any(self.v.hallway[room + 2 : hall]))
+    def is_organized(self, burrow: Burrow) -> bool:
+        rooms, _ = burrow
+        return all(
+            len(room) == self.room_size and _is_clean(r, room)
+            for r, room in enumerate(rooms)
         )
 
-    def _move(self, amphipod: int, r: int, h: int, *, into_room: bool) -> AmphipodState:
-        rooms = [copy(room) for room in self.v.rooms]
-        room = rooms[r]
-        hallway = self.v.hallway[:]
+    def _move(
+        self, burrow: Burrow, r: int, h: int, *, into_room: bool
+    ) -> tuple[Burrow, int]:
+        rooms, hallway = burrow
+        room, new_hallway = list(rooms[r]), list(hallway)
 
         if into_room:
-            room.add(hallway[h])
-            hallway[h] = 0
+            amphipod = new_hallway[h]
+            room.append(amphipod)
+            new_hallway[h] = 0
         else:
-            hallway[h] = room.remove()
+            amphipod = new_hallway[h] = room.pop()
 
         is_on_hall_end = h in (0, 6)
         # Trust me, I'm an engineer
@@ -113,30 +64,35 @@ class AmphipodState(DijkstraState[Constants, Variables]):
             abs(h * 2 - r * 2 - 3)
             + 1
             - int(is_on_hall_end)
-            + room.spots_left
+            + self.room_size
+            - len(room)
             - int(into_room)
         )
-        return self.move(
-            Variables(rooms, hallway), distance=steps * 10 ** (amphipod - 1)
-        )
+        new_rooms = (*rooms[:r], tuple(room), *rooms[r + 1 :])
+        return (new_rooms, tuple(new_hallway)), steps * 10 ** (amphipod - 1)
 
-    @property
-    def next_states(self) -> Iterator[AmphipodState]:
+    def next_states(self, burrow: Burrow) -> Iterator[tuple[Burrow, int]]:
+        rooms, hallway = burrow
         # all states that move an amphipod out of a room
-        for r, room in enumerate(self.v.rooms):
-            if not room.is_clean and not room.is_empty:
-                for h, amphipod in enumerate(self.v.hallway):
-                    if not amphipod and self._can_move(r, h):
-                        yield self._move(room.first, r, h, into_room=False)
-
-        # all states that move an amphipod into a room
-        for h, amphipod in enumerate(self.v.hallway):
+        for r, room in enumerate(rooms):
+            if room and not _is_clean(r, room):
+                for h, amphipod in enumerate(hallway):
+                    if not amphipod and _can_move(r, h, hallway):
+                        yield self._move(burrow, r, h, into_room=False)
+
+        # all states that move an amphipod into (its own) room
+        for h, amphipod in enumerate(hallway):
             if amphipod:
-                for r, room in enumerate(self.v.rooms):
-                    if room.can_add(amphipod) and self._can_move(r, h):
-                        yield self._move(amphipod, r, h, into_room=True)
-
-    def to_lines(self) -> Iterator[str]:
+                r = amphipod - 1
+                room = rooms[r]
+                if (
+                    len(room) < self.room_size
+                    and _is_clean(r, room)
+                    and _can_move(r, h, hallway)
+                ):
+                    yield self._move(burrow, r, h, into_room=True)
+
+    def to_lines(self, burrow: Burrow) -> Iterator[str]:
         """
         Code is not meant to look readable, just to print the mushroom.
 
@@ -163,16 +119,17 @@ class AmphipodState(DijkstraState[Constants, Variables]):
         def p(r: int) -> str:
             return "  " if r > 0 else w * 2
 
+        rooms, hallway = burrow
         s = ".ABCD"
-        h = ".".join(s[a] for a in self.v.hallway)
-        rs = self.c.room_size
+        h = ".".join(s[a] for a in hallway)
+        rs = self.room_size
         yield f"{w * 13}"
         yield f"{w + colored(h[0] + h[2:-2] + h[-1]) + w}"
         for i in range(rs):
             yield (
                 p(i)
                 + w
-                + w.join(colored(s[r.get(rs - i - 1)]) for r in self.v.rooms)
+                + w.join(colored(s[(*r, *[0] * rs)[rs - i - 1]]) for r in rooms)
                 + w
                 + p(i)
             )
@@ -186,26 +143,27 @@ class _Problem(MultiLineProblem[int], ABC):
         pass
 
     @property
-    def _room_content(self) -> Iterator[list[int]]:
+    def _room_content(self) -> Iterator[Room]:
         room_input: Iterator[tuple[str, ...]] = zip(
             *(line[3:10:2] for line in self._input_lines), strict=True
         )
         for content in room_input:
-            yield [upper_to_num(c) for c in content]
+            yield tuple(upper_to_num(c) for c in content)
 
     def solution(self) -> int:
         room_size = len(self._input_lines)
-        rooms = [
-            Room(name, room_size, content)
-            for name, content in enumerate(self._room_content, 1)
-        ]
-        path = AmphipodState.find_path(Variables(rooms), Constants(room_size))
-
-        def fmt(item: tuple[int, AmphipodState]) -> Iterator[str]:
-            i, state = item
-            yield f"Step {i}, cost so far: {state.cost}" if i > 0 else ""
+        amphipods = Amphipods(room_size)
+        path = dijkstra(
+            (tuple(self._room_content), EMPTY_HALLWAY),
+            amphipods.next_states,
+            amphipods.is_organized,
+        )
+
+        def fmt(item: tuple[int, Burrow]) -> Iterator[str]:
+            i, burrow = item
+            yield f"Step {i}, cost so far: {path.costs[burrow]}" if i > 0 else ""
             yield ""
-            yield from state.to_lines()
+            yield from amphipods.to_lines(burrow)
             yield ""
 
         log.debug_animated(
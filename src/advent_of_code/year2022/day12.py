@@ -1,8 +1,6 @@
 from abc import ABC
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING
 
-from based_utils.algo import AStarState, BFSState, DijkstraState, State
 from based_utils.cli import Table, human_readable_duration, timed
 from kleur import Colored, ColorStr, Highlighter
 
@@ -10,65 +8,29 @@ from advent_of_code import C, log
 from advent_of_code.problems import NumGridProblem
 from advent_of_code.utils import lower_to_num, num_to_lower
 from advent_of_code.utils.geo2d import P2, NumGrid2
+from advent_of_code.utils.search import a_star, bfs, dijkstra
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
     from kleur import Color
 
+    from advent_of_code.utils.search import Neighbors
 
-@dataclass
-class Constants:
-    hill: NumGrid2
-    goal: int
-    reverse: bool
 
+def climbable(hill: NumGrid2, *, reverse: bool) -> Neighbors[P2]:
+    def next_positions(pos: P2) -> Iterator[P2]:
+        height = hill[pos]
+        for new_pos, new_height in hill.neighbors(pos):
+            if (height <= new_height + 1) if reverse else (new_height <= height + 1):
+                yield new_pos
 
-class Variables(NamedTuple):
-    pos: P2
-
-
-class _State[C: Constants](State[C, Variables], ABC):
-    @property
-    def is_end_state(self) -> bool:
-        return self.c.hill[self.v.pos] == self.c.goal
-
-    @property
-    def next_states(self) -> Iterator[_State]:
-        height = self.c.hill[self.v.pos]
-        for new_pos, new_height in self.c.hill.neighbors(self.v.pos):
-            if (
-                (height <= new_height + 1)
-                if self.c.reverse
-                else (new_height <= height + 1)
-            ):
-                yield self.move(Variables(new_pos))
-
-
-class _BFSState(_State, BFSState[Constants, Variables]):
-    pass
-
-
-class _DijkstraState(_State, DijkstraState[Constants, Variables]):
-    pass
-
-
-@dataclass
-class AStarConstants(Constants):
-    heuristic_end_pos: P2
-
-
-class _AStarState(_State, AStarState[AStarConstants, Variables]):
-    @property
-    def heuristic(self) -> int:
-        x, y = self.v.pos
-        ex, ey = self.c.heuristic_end_pos
-        horizontal_distance = abs(ex - x) + abs(ey - y)
-        vertical_distance = abs(self.c.goal - self.c.hill[self.v.pos])
-        return horizontal_distance + vertical_distance
+    return next_positions
 
 
 class _Problem(NumGridProblem[int], ABC):
+    cache_input = True
+
     def parse_value(self, c: str) -> int:
         return {"S": 0, "E": 27}.get(c, lower_to_num(c))
 
@@ -76,36 +38,44 @@ class _Problem(NumGridProblem[int], ABC):
         start_val, end_val = self.parse_value(start), self.parse_value(end)
         start_pos = self.grid.point_with_value(start_val)
         ep = self.grid.points_with_value(end_val)
+        hill = self.grid
+        next_positions = climbable(hill, reverse=end_val < start_val)
+
+        def weighted(pos: P2) -> Iterator[tuple[P2, int]]:
+            return ((new_pos, 1) for new_pos in next_positions(pos))
 
-        c = Constants(self.grid, end_val, reverse=end_val < start_val)
-        p_bfs, t_bfs = timed(lambda: _BFSState.find_path(Variables(start_pos), c))
+        def is_end(pos: P2) -> bool:
+            return hill[pos] == end_val
+
+        p_bfs, t_bfs = timed(lambda: bfs(start_pos, next_positions, is_end))
 
         def _debug_str() -> Iterator[str]:
-            visited_points_bfs: set[P2] = {s.v.pos for s in p_bfs.visited_states}
+            visited_points_bfs = set(p_bfs.visited)
 
             p_dijkstra, t_dijkstra = timed(
-                lambda: _DijkstraState.find_path(Variables(start_pos), c)
+                lambda: dijkstra(start_pos, weighted, is_end)
             )
-            visited_points_dijkstra: set[P2] = {
-                s.v.pos for s in p_dijkstra.visited_states
-            }
+            visited_points_dijkstra = set(p_dijkstra.visited)
 
             if len(ep) == 1:
-                reverse = end_val < start_val
-                end_pos, *_ = ep
-                ac = AStarConstants(self.grid, end_val, reverse, end_pos)
+                (ex, ey), *_ = ep
+
+                def heuristic(pos: P2) -> int:
+                    x, y = pos
+                    horizontal_distance = abs(ex - x) + abs(ey - y)
+                    vertical_distance = abs(end_val - hill[pos])
+                    return horizontal_distance + vertical_distance
+
                 p_a_star, t_a_star = timed(
-                    lambda: _AStarState.find_path(Variables(start_pos), ac)
+                    lambda: a_star(start_pos, weighted, is_end, heuristic)
                 )
-                visited_points_a_star: set[P2] = {
-                    s.v.pos for s in p_a_star.visited_states
-                }
+                visited_points_a_star = set(p_a_star.visited)
             else:
                 p_a_star = None
                 t_a_star = 0
                 visited_points_a_star = set[P2]()
 
-            p_points: set[P2] = {s.v.pos for s in p_bfs.states}
+            p_points = set(p_bfs.states)
             hill_chars = {
                 p: {0: "S", 27: "E"}.get(h, num_to_lower(h))
                 for p, h in self.grid.items()
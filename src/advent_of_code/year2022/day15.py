@@ -12,6 +12,7 @@ from advent_of_code.utils.geo2d import (
     intersect_segments_2,
     manhattan_dist_2,
 )
+from advent_of_code.utils.intervals import IntervalSet
 
 ORDINAL_DIRECTIONS = [LEFT_DOWN, RIGHT_UP, LEFT_UP, RIGHT_DOWN]
 
@@ -25,27 +26,12 @@ def coverage(sensor: P2, beacon: P2, y: int) -> P2 | None:
     return sx - dist + dy, sx + dist - dy
 
 
-def merge(first: P2, *rest: P2) -> list[P2]:
-    min1, max1 = first
-    if not rest:
-        return [first]
-    merged = []
-    not_merged = []
-    for min2, max2 in rest:
-        if max1 + 1 >= min2 and min1 <= max2 + 1:
-            merged.append((min(min1, min2), max(max1, max2)))
-        else:
-            not_merged.append((min2, max2))
-    if merged:
-        return merge(*not_merged, *merged)
-    return [*merge(*not_merged), first]
-
-
 class _Problem(ParsedProblem[tuple[int, int, int, int], int], ABC):
     line_pattern = "Sensor at x={:d}, y={:d}: closest beacon is at x={:d}, y={:d}"
+    cache_input = True
 
     def __init__(self) -> None:
-        self.locations = [((sx, sy), (bx, by)) for sx, sy, bx, by in self.parsed_input]
+        self.locations = [((sx, sy), (bx, by)) for sx, sy, bx, by in self.iter_parsed()]
         self.size = self.var(test=10, puzzle=2_000_000)
 
 
@@ -54,11 +40,13 @@ class Problem1(_Problem):
     puzzle_solution = 5144286
 
     def solution(self) -> int:
-        merged = merge(
-            *(c for s, b in self.locations if (c := coverage(s, b, self.size)))
-        )
-        return sum(high - low + 1 for low, high in merged) - sum(
-            y == self.size and any(low <= x <= high for low, high in merged)
+        covered = IntervalSet()
+        for s, b in self.locations:
+            if c := coverage(s, b, self.size):
+                low, high = c
+                covered.add(low, high + 1)
+        return covered.size - sum(
+            y == self.size and x in covered
             for x, y in {p for pair in self.locations for p in pair}
         )
 
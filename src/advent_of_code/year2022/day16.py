@@ -18,12 +18,15 @@ class _Problem(ParsedProblem[tuple[int, ...], int], ABC):
 
 class Problem1(_Problem):
     test_solution = 1651
+    is_unfinished = True
 
     def solution(self) -> int:
         return 0
 
 
 class Problem2(_Problem):
+    is_unfinished = True
+
     def solution(self) -> int:
         return 0
 
@@ -1,15 +1,14 @@
 from abc import ABC
 from collections import deque
-from collections.abc import Iterable
-from itertools import count, cycle
-from typing import TYPE_CHECKING
+from itertools import count
+from typing import TYPE_CHECKING, NamedTuple
 
-from based_utils.algo import detect_cycle
-from more_itertools import nth_or_last, unzip
+from more_itertools import nth_or_last
 from ternimator import AnimParams
 
 from advent_of_code import log
 from advent_of_code.problems import OneLineProblem
+from advent_of_code.utils.cycles import find_cycle
 from advent_of_code.utils.geo2d import CharGrid2
 
 if TYPE_CHECKING:
@@ -26,7 +25,6 @@ SHAPES = [
 ]
 
 type Shape = list[int]
-type Pattern = Iterable[int]
 
 
 class MaxHeightReachedError(RuntimeError):
@@ -36,12 +34,22 @@ class MaxHeightReachedError(RuntimeError):
         )
 
 
+class Landing(NamedTuple):
+    height: int
+    y: int
+    # Top rows of the tower (live: changes as the next rocks land).
+    pattern: deque[int]
+    shape: Shape
+    # Where the shapes and the jets are at in their cycles.
+    next_shape: int
+    next_jet: int
+
+
 class _Problem(OneLineProblem[int], ABC):
-    def play(self) -> Iterator[tuple[int, int, Pattern, Shape]]:
+    def play(self) -> Iterator[Landing]:
         pattern = deque([0b1111111] * MAX_HEIGHT, maxlen=MAX_HEIGHT)
         height = 0
-        directions = cycle(self.line)
-        shapes = cycle(SHAPES)
+        s = j = 0
 
         def occludes_with(shape: Shape, y_: int) -> bool:
             return any(
@@ -57,12 +65,14 @@ class _Problem(OneLineProblem[int], ABC):
             return shape if occ_side or occ_pat else moved
 
         while True:
-            curr_shape = next(shapes)
+            curr_shape = SHAPES[s]
+            s = (s + 1) % len(SHAPES)
             for y in count(-4):
                 if y == MAX_HEIGHT:
                     raise MaxHeightReachedError
 
-                curr_shape = try_move(next(directions), curr_shape, y)
+                curr_shape = try_move(self.line[j], curr_shape, y)
+                j = (j + 1) % len(self.line)
 
                 if y < -1 or not occludes_with(curr_shape, y + 1):
                     continue
@@ -75,12 +85,12 @@ class _Problem(OneLineProblem[int], ABC):
                     else:
                         pattern[py] |= row
 
-                yield height, y, list(pattern), curr_shape
+                yield Landing(height, y, pattern, curr_shape, s, j)
                 break
 
     def height_at_t(self, t: int) -> int:
-        def format_state(item: tuple[int, int, Pattern, Shape]) -> Iterator[str]:
-            _height, y, pattern, shape = item
+        def format_state(item: Landing) -> Iterator[str]:
+            _height, y, pattern, shape, *_ = item
 
             def value(row_: int, r: int, c: int) -> str:
                 n = len(shape)
@@ -100,8 +110,7 @@ class _Problem(OneLineProblem[int], ABC):
         )
         state_at_t = nth_or_last(it, t - 1)
         log.lazy_debug(lambda: format_state(state_at_t))
-        height, *_ = state_at_t
-        return height
+        return state_at_t.height
 
 
 class Problem1(_Problem):
@@ -117,13 +126,18 @@ class Problem2(_Problem):
     puzzle_solution = 1570930232582
 
     def solution(self) -> int:
-        _heights, _ys, patterns, _shapes = unzip(self.play())
-        cycle_ = detect_cycle(patterns)
-        n = 1_000_000_000_000 - cycle_.start
-        h_cycle = self.height_at_t(cycle_.start + cycle_.length)
-        h_start = self.height_at_t(cycle_.start)
-        h_trillion = self.height_at_t(cycle_.start + n % cycle_.length)
-        return (h_cycle - h_start) * (n // cycle_.length) + h_trillion
+        # The top rows (packed into an int) and the positions in the cycles of
+        # shapes & jets make up the whole state: from a repeated state on, the
+        # tower grows the same every cycle.
+        cycle = find_cycle(
+            (
+                (landing.next_shape, landing.next_jet, int.from_bytes(landing.pattern)),
+                landing.height,
+            )
+            for landing in self.play()
+        )
+        log.debug(f"Cycle of {cycle.length} rocks, from rock {cycle.start + 1} on")
+        return cycle.extrapolate(1_000_000_000_000 - 1)
 
 
 TEST_INPUT = ">>><<><>><<<>><>>><<<>>><<<><<<>><>><<>>"
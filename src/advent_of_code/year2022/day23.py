@@ -1,11 +1,7 @@
 from abc import ABC
-from collections import defaultdict
 from itertools import count
 from typing import TYPE_CHECKING
 
-from based_utils.iterators import first_duplicate
-from more_itertools import nth_or_last
-
 from advent_of_code import log
 from advent_of_code.problems import CharGridProblem
 from advent_of_code.utils.geo2d import (
@@ -19,47 +15,112 @@ from advent_of_code.utils.geo2d import (
     RIGHT_UP,
     UP,
     NumGrid2,
-    all_directions,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Set
+    from collections.abc import Iterable, Iterator
 
+# Direction to move in, and the directions that should be free to do so.
 DIRECTIONS = [
-    (UP, {UP, LEFT_UP, RIGHT_UP}),
-    (DOWN, {DOWN, LEFT_DOWN, RIGHT_DOWN}),
-    (LEFT, {LEFT, LEFT_UP, LEFT_DOWN}),
-    (RIGHT, {RIGHT, RIGHT_UP, RIGHT_DOWN}),
+    (UP, (UP, LEFT_UP, RIGHT_UP)),
+    (DOWN, (DOWN, LEFT_DOWN, RIGHT_DOWN)),
+    (LEFT, (LEFT, LEFT_UP, LEFT_DOWN)),
+    (RIGHT, (RIGHT, RIGHT_UP, RIGHT_DOWN)),
 ]
 
 
-def next_pos(x: int, y: int, step: int, occupied: Set[P2]) -> P2 | None:
-    for i in range(step, 4 + step):
-        (dx, dy), dirs = DIRECTIONS[i % 4]
-        if all((x + nx, y + ny) not in occupied for nx, ny in dirs) and any(
-            (x + nx, y + ny) in occupied for nx, ny in all_directions
-        ):
-            return x + dx, y + dy
-    return None
+class Grove:
+    """
+    Elves on a bitboard: a single int with a bit for every position, row by row.
+
+    Every direction is a shift by a fixed number of bits, so a round takes a few
+    operations on the whole board, instead of checking every elf separately.
+    The board is surrounded by empty space, and laid out anew (with more space)
+    whenever an elf gets close to the edge.
+    """
+
+    def __init__(self, elves: Iterable[P2]) -> None:
+        self.rounds = 0
+        self._lay_out(list(elves), margin=16)
+
+    def _lay_out(self, elves: list[P2], margin: int) -> None:
+        xs, ys = [x for x, _ in elves], [y for _, y in elves]
+        self._origin = min(xs) - margin, min(ys) - margin
+        self._stride = max(xs) - min(xs) + 1 + margin * 2
+        height = max(ys) - min(ys) + 1 + margin * 2
+        x_lo, y_lo = self._origin
+        self.board = sum(1 << ((y - y_lo) * self._stride + x - x_lo) for x, y in elves)
+
+        # Elves in the two outer rows or columns could leave the board next round.
+        inner_row = ((1 << (self._stride - 4)) - 1) << 2
+        inner = sum(inner_row << (y * self._stride) for y in range(2, height - 2))
+        self._edge = ((1 << (height * self._stride)) - 1) & ~inner
+
+    def _offset(self, direction: P2) -> int:
+        dx, dy = direction
+        return dy * self._stride + dx
+
+    def _neighbors(self, direction: P2) -> int:
+        """Positions that have an elf as a neighbor in the given direction."""
+        offset = self._offset(direction)
+        return self.board >> offset if offset > 0 else self.board << -offset
+
+    def _moved(self, bits: int, direction: P2, *, back: bool = False) -> int:
+        offset = -self._offset(direction) if back else self._offset(direction)
+        return bits << offset if offset > 0 else bits >> -offset
+
+    @property
+    def elves(self) -> Iterator[P2]:
+        x_lo, y_lo = self._origin
+        board = self.board
+        while board:
+            bit = (board & -board).bit_length() - 1
+            board &= board - 1
+            y, x = divmod(bit, self._stride)
+            yield x + x_lo, y + y_lo
+
+    def __len__(self) -> int:
+        return self.board.bit_count()
+
+    def play_round(self) -> bool:
+        """Let all elves move (if they can), returns whether any of them did."""
+        if self.board & self._edge:
+            self._lay_out(list(self.elves), margin=self._stride)
+
+        neighbors = {d: self._neighbors(d) for _, dirs in DIRECTIONS for d in dirs}
+        # Only elves with any neighbors move.
+        undecided = self.board & (
+            neighbors[UP] | neighbors[DOWN] | neighbors[LEFT] | neighbors[RIGHT]
+            | neighbors[LEFT_UP] | neighbors[RIGHT_UP]
+            | neighbors[LEFT_DOWN] | neighbors[RIGHT_DOWN]
+        )  # fmt: skip
+        targets = {}
+        for i in range(self.rounds, self.rounds + 4):
+            direction, dirs = DIRECTIONS[i % 4]
+            blocked = neighbors[dirs[0]] | neighbors[dirs[1]] | neighbors[dirs[2]]
+            proposing = undecided & ~blocked
+            undecided &= blocked
+            targets[direction] = self._moved(proposing, direction)
+        self.rounds += 1
+
+        # Elves can only propose the same position when coming from opposite sides.
+        moved = 0
+        for d, opposite in (UP, DOWN), (LEFT, RIGHT):
+            clash = targets[d] & targets[opposite]
+            for direction in d, opposite:
+                arrived = targets[direction] & ~clash
+                left = self._moved(arrived, direction, back=True)
+                self.board = (self.board & ~left) | arrived
+                moved |= arrived
+        return moved != 0
 
 
 class _Problem(CharGridProblem[int], ABC):
+    cache_input = True
+
     def __init__(self) -> None:
         log.lazy_debug(self.grid.to_lines)
-
-    def dance(self) -> Iterator[frozenset[P2]]:
-        occupied = frozenset(p for p, v in self.grid.items() if v == "#")
-        elfs: dict[int, P2] = dict(enumerate(occupied, 1))
-        for step in count():
-            yield occupied
-            proposal = defaultdict(list)
-            for elf, (x, y) in elfs.items():
-                if pos := next_pos(x, y, step, occupied):
-                    proposal[pos].append(elf)
-            for p, proposing_elfs in proposal.items():
-                if len(proposing_elfs) == 1:
-                    elfs[proposing_elfs[0]] = p
-            occupied = frozenset(elfs.values())
+        self.grove = Grove(p for p, v in self.grid.items() if v == "#")
 
 
 class Problem1(_Problem):
@@ -67,9 +128,11 @@ class Problem1(_Problem):
     puzzle_solution = 3788
 
     def solution(self) -> int:
-        elfs = NumGrid2(dict.fromkeys(nth_or_last(self.dance(), 10), 1))
-        log.lazy_debug(elfs.to_lines)
-        return elfs.area - len(elfs)
+        for _ in range(10):
+            self.grove.play_round()
+        elves = NumGrid2(dict.fromkeys(self.grove.elves, 1))
+        log.lazy_debug(elves.to_lines)
+        return elves.area - len(elves)
 
 
 class Problem2(_Problem):
@@ -77,8 +140,8 @@ class Problem2(_Problem):
     puzzle_solution = 921
 
     def solution(self) -> int:
-        n, elfs = first_duplicate(self.dance())
-        log.lazy_debug(NumGrid2(dict.fromkeys(elfs, 1)).to_lines)
+        n = next(n for n in count(1) if not self.grove.play_round())
+        log.lazy_debug(NumGrid2(dict.fromkeys(self.grove.elves, 1)).to_lines)
         return n
 
 
@@ -1,22 +1,22 @@
 from abc import ABC
-from dataclasses import dataclass
-from functools import cached_property
 from math import lcm
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING
 
-from based_utils.algo import AStarState
 from kleur import Color
 
 from advent_of_code import C, log
-from advent_of_code.problems import CharGridProblem
+from advent_of_code.problems import CharGridProblem, shared_property
 from advent_of_code.utils import lowlighted
 from advent_of_code.utils.geo2d import DOWN, LEFT, P2, RIGHT, UP, manhattan_dist_2
+from advent_of_code.utils.search import a_star
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
     from kleur import ColorStr
 
+    from advent_of_code.utils.search import SearchResult
+
 DIRECTION_TILES: list[str] = ["^", "v", "<", ">"]
 TILES = [*DIRECTION_TILES, "."]
 DIRECTIONS: dict[str, P2] = {"^": UP, "v": DOWN, "<": LEFT, ">": RIGHT}
@@ -30,50 +30,8 @@ COLORS = {
 }
 
 
-@dataclass
-class Constants:
-    start: P2
-    end: P2
-    ground: frozenset[P2]
-    blizzards: list[set[P2]]
-
-    @cached_property
-    def num_valleys(self) -> int:
-        return len(self.blizzards)
-
-    def reverse_direction(self) -> None:
-        self.start, self.end = self.end, self.start
-
-
-class Variables(NamedTuple):
-    pos: P2 = 1, 0
-    cycle: int = 1
-
-
-class ValleyState(AStarState[Constants, Variables]):
-    @property
-    def is_end_state(self) -> bool:
-        return self.v.pos == self.c.end
-
-    @property
-    def next_states(self) -> Iterator[ValleyState]:
-        def neighbors() -> Iterator[P2]:
-            x, y = self.v.pos
-            for dx, dy in DIRECTIONS.values():
-                yield x + dx, y + dy
-            yield x, y
-
-        blizzards = self.c.blizzards[self.v.cycle % self.c.num_valleys]
-        for pos in neighbors():
-            if pos in self.c.ground and pos not in blizzards:
-                yield self.move(Variables(pos, self.v.cycle + 1))
-
-    @property
-    def heuristic(self) -> int:
-        return manhattan_dist_2(self.v.pos, self.c.end)
-
-    def __repr__(self) -> str:
-        return f"{self.v.pos} - {self.v.cycle}"
+# Position, and the time (modulo the period with which the blizzards repeat).
+type ValleyState = tuple[P2, int]
 
 
 class _Problem(CharGridProblem[int], ABC):
@@ -81,20 +39,44 @@ class _Problem(CharGridProblem[int], ABC):
         self.grouped_tiles = {t: self.grid.points_with_value(t) for t in TILES}
         self.ground = frozenset.union(*self.grouped_tiles.values())
         self.size = w, h = self.grid.width - 2, self.grid.height - 2
-        start, end = (1, 0), (w, h + 1)
-        blizzards = list(self.blizzard_states())
-        self.constants = Constants(start, end, self.ground, blizzards)
-        self.path = ValleyState.find_path(Variables(), self.constants)
+        self.start, self.end = (1, 0), (w, h + 1)
 
         def grid_str() -> Iterator[str]:
             def format_value(_p: P2, v: str, _colored: ColorStr) -> ColorStr:
                 return COLORS[v]
 
-            positions = {s.v.pos for s in self.path.states}
+            positions = {pos for pos, _ in self.path.states}
             return self.grid.to_lines(format_value=format_value, highlighted=positions)
 
         log.lazy_debug(grid_str)
 
+    @shared_property
+    def blizzards(self) -> list[set[P2]]:
+        return list(self.blizzard_states())
+
+    @shared_property
+    def path(self) -> SearchResult[ValleyState]:
+        """Fastest way from start to end (the first trip of both parts)."""
+        return self.trip(self.start, self.end)
+
+    def next_states(self, state: ValleyState) -> Iterator[tuple[ValleyState, int]]:
+        (x, y), t = state
+        blizzards = self.blizzards[t]
+        t = (t + 1) % len(self.blizzards)
+        for dx, dy in [*DIRECTIONS.values(), (0, 0)]:
+            pos = x + dx, y + dy
+            if pos in self.ground and pos not in blizzards:
+                yield (pos, t), 1
+
+    def trip(self, start: P2, end: P2, t: int = 1) -> SearchResult[ValleyState]:
+        """Fastest way through the valley, starting at the given time."""
+        return a_star(
+            (start, t % len(self.blizzards)),
+            self.next_states,
+            lambda state: state[0] == end,
+            lambda state: manhattan_dist_2(state[0], end),
+        )
+
     def new_blizzards(self, t: str, bs: frozenset[P2]) -> frozenset[P2]:
         dx, dy = DIRECTIONS[t]
         w, h = self.size
@@ -120,11 +102,10 @@ class Problem2(_Problem):
     puzzle_solution = 720
 
     def solution(self) -> int:
-        first = self.path.end_state
-        self.constants.reverse_direction()
-        second = first.find_path_from_current_state().end_state
-        self.constants.reverse_direction()
-        return second.find_path_from_current_state().length
+        t = 1 + self.path.length
+        t += self.trip(self.end, self.start, t).length
+        t += self.trip(self.start, self.end, t).length
+        return t - 1
 
 
 TEST_INPUT = """
@@ -1,19 +1,12 @@
 from abc import ABC
 from functools import reduce
 from itertools import batched
-from typing import TYPE_CHECKING
 
 from more_itertools import split_at
 
 from advent_of_code import log
 from advent_of_code.problems import MultiLineProblem
-
-if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
-
-    from advent_of_code.utils.geo2d import Range
-
-type MapEntry = tuple[int, int, int]
+from advent_of_code.utils.intervals import RangeMap
 
 
 class _Problem(MultiLineProblem[int], ABC):
@@ -21,9 +14,12 @@ class _Problem(MultiLineProblem[int], ABC):
         seeds, *maps = split_at(self.lines, lambda x: x == "")
         self.seeds = [int(i) for i in seeds[0][7:].split()]
         items = [[[int(i) for i in vals.split()] for vals in m[1:]] for m in maps]
-        self.maps = [sorted((s, s + o, d - s) for d, s, o in f) for f in items]
+        # All maps fused into one, mapping seeds to locations directly.
+        self.almanac = reduce(
+            RangeMap.then, (RangeMap((s, s + o, d - s) for d, s, o in f) for f in items)
+        )
         log.debug(f"Seeds: {self.seeds}")
-        log.debug(f"Maps: {self.maps}")
+        log.debug(f"Seed to location: {list(self.almanac.pieces)}")
 
 
 class Problem1(_Problem):
@@ -31,13 +27,7 @@ class Problem1(_Problem):
     puzzle_solution = 309796150
 
     def solution(self) -> int:
-        def get_next_value(item: int, m: Iterable[MapEntry]) -> int:
-            for start, end, offset in m:
-                if start <= item < end:
-                    return item + offset
-            return item
-
-        return min(reduce(get_next_value, self.maps, seed) for seed in self.seeds)
+        return min(self.almanac(seed) for seed in self.seeds)
 
 
 class Problem2(_Problem):
@@ -45,28 +35,8 @@ class Problem2(_Problem):
     puzzle_solution = 50716416
 
     def solution(self) -> int:
-        def get_next_ranges(
-            ranges: Iterable[Range], m: Iterable[MapEntry]
-        ) -> Iterator[Range]:
-            for r in ranges:
-                s, e = r
-                for start, end, offset in m:
-                    if s < start:
-                        yield s, min(e, start)
-                    if start >= e:
-                        break
-                    if s >= end:
-                        continue
-                    yield max(s, start) + offset, min(end, e) + offset
-                    s = end
-                else:
-                    if s < e:
-                        yield s, e
-
-        seed_ranges: Iterable[Range] = (
-            (s, s + o) for s, o in batched(self.seeds, 2, strict=True)
-        )
-        return min(s for s, _ in reduce(get_next_ranges, self.maps, seed_ranges))
+        seed_ranges = ((s, s + o) for s, o in batched(self.seeds, 2, strict=True))
+        return self.almanac.image(seed_ranges).min
 
 
 TEST_INPUT = """
@@ -20,6 +20,8 @@ CONNECTIONS = {
 
 
 class _Problem(CharGridProblem[int], ABC):
+    cache_input = True
+
     def first_neighbor(self, sx: int, sy: int) -> P2:
         for (x, y), v in self.grid.neighbors((sx, sy)):
             if v != "." and (sx - x, sy - y) in CONNECTIONS[v]:
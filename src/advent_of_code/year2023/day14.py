@@ -1,46 +1,49 @@
 from abc import ABC
-from collections.abc import Iterable, Iterator
-from itertools import groupby
+from typing import TYPE_CHECKING
 
-from based_utils.algo import detect_cycle
-from based_utils.iterators import repeat_transform, rotated_cw
-from more_itertools import last
+import numpy as np
+from based_utils.iterators import repeat_transform
 
 from advent_of_code import log
 from advent_of_code.problems import CharGridProblem
+from advent_of_code.utils.cycles import find_cycle
 from advent_of_code.utils.geo2d import CharGrid2
+from advent_of_code.utils.grid_arrays import rotate
 
-type Line = tuple[str, ...]
-type Lines = Iterable[Line]
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
+type Mask = NDArray[np.bool]
 
-def debug_grid(lines: Lines) -> None:
-    log.lazy_debug(CharGrid2.from_lines(["".join(line) for line in lines]).to_lines)
 
-
-class _Problem(CharGridProblem[int], ABC):
-    def __init__(self) -> None:
-        self.cols: Lines = [
-            tuple(v for (x, _), v in self.grid.items() if x == c)
-            for c in range(self.grid.width)
-        ]
-        debug_grid(self.cols)
+def debug_grid(cubes: Mask, rocks: Mask) -> None:
+    chars = np.where(cubes, "#", np.where(rocks, "O", "."))
+    log.lazy_debug(lambda: CharGrid2.from_array(chars).to_lines())
 
 
-def reordered(col: Line) -> Iterator[str]:
-    for k, g in groupby(col, lambda v: v == "#"):
-        if k:
-            yield from g
-        else:
-            yield from sorted(g, reverse=True)
+def tilt(cubes: Mask, rocks: Mask) -> Mask:
+    """Let all rocks roll north, until they hit a cube or the edge."""
+    h, w = rocks.shape
+    ys, xs = np.indices((h, w))
+    # Cubes split up the columns into sections, which start right below them.
+    sections = np.cumsum(cubes, axis=0)
+    starts = np.maximum.accumulate(np.where(cubes, ys + 1, 0), axis=0)
+    rocks_per_section = np.zeros((h + 1, w), dtype=np.int_)
+    np.add.at(rocks_per_section, (sections, xs), rocks)
+    # Every section gets filled up with its rocks from the top.
+    return ~cubes & (ys - starts < rocks_per_section[sections, xs])
 
 
-def tilt(cols: Lines) -> Lines:
-    return rotated_cw(reordered(col) for col in cols)
+def load(rocks: Mask) -> int:
+    h, _ = rocks.shape
+    return int((rocks * (h - np.indices(rocks.shape)[0])).sum())
 
 
-def load(rows: Lines) -> int:
-    return sum(sum(v == "O" for v in row) * i for i, row in enumerate(rows, 1))
+class _Problem(CharGridProblem[int], ABC):
+    def __init__(self) -> None:
+        grid = self.grid.as_array()
+        self.cubes, self.rocks = grid == "#", grid == "O"
+        debug_grid(self.cubes, self.rocks)
 
 
 class Problem1(_Problem):
@@ -48,29 +51,36 @@ class Problem1(_Problem):
     puzzle_solution = 109596
 
     def solution(self) -> int:
-        tilted = list(tilt(self.cols))
-        debug_grid(tilted)
+        tilted = tilt(self.cubes, self.rocks)
+        debug_grid(self.cubes, tilted)
         return load(tilted)
 
 
-def tilt_cycle(c: Lines) -> Lines:
-    return list(last(repeat_transform(c, transform=tilt, times=4)))
-
-
 class Problem2(_Problem):
     test_solution = 64
     puzzle_solution = 96105
 
+    def __init__(self) -> None:
+        super().__init__()
+        # Tilting north, west, south & east is the same as tilting north 4 times,
+        # rotating the platform clockwise after every tilt.
+        self.rotated_cubes = list(
+            repeat_transform(self.cubes, transform=rotate, times=4)
+        )
+
+    def tilt_cycle(self, rocks: Mask) -> Mask:
+        for cubes in [self.cubes, *self.rotated_cubes[:3]]:
+            rocks = rotate(tilt(cubes, rocks))
+        return rocks
+
     def solution(self) -> int:
-        cycle = detect_cycle(repeat_transform(self.cols, transform=tilt_cycle))
-        tilt_sequence = repeat_transform(
-            self.cols,
-            transform=tilt_cycle,
-            times=cycle.start + (1_000_000_000 - cycle.start) % cycle.length,
+        cycle = find_cycle(
+            (np.packbits(rocks).tobytes(), rocks)
+            for rocks in repeat_transform(self.rocks, transform=self.tilt_cycle)
         )
-        result = list(rotated_cw(last(tilt_sequence)))
-        debug_grid(result)
-        log.debug(cycle)
+        log.debug(f"Cycle of {cycle.length} tilt cycles, from {cycle.start} on")
+        result = cycle[1_000_000_000 - 1]
+        debug_grid(self.cubes, result)
         return load(result)
 
 
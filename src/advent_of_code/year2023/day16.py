@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 
 class _Problem(CharGridProblem[int], ABC):
+    cache_input = True
+
     def energized(self, start: tuple[P2, P2]) -> Set[P2]:
         beams = deque([start])
         visited = set()
@@ -1,73 +1,52 @@
 from abc import ABC
-from typing import TYPE_CHECKING, NamedTuple, Self
-
-from based_utils.algo import DijkstraState
+from typing import TYPE_CHECKING
 
 from advent_of_code import log
 from advent_of_code.problems import NumGridProblem
-from advent_of_code.utils.geo2d import DOWN, LEFT, P2, RIGHT, UP, NumGrid2, Range
+from advent_of_code.utils.grid_search import GridGraph, Modes
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
-
-
-class Constants:
-    def __init__(self, grid: NumGrid2, segment_range: Range) -> None:
-        self.grid = grid
-        self.min_segment, self.max_segment = segment_range
-        self.end = grid.width - 1, grid.height - 1
+    from advent_of_code.utils.geo2d import Range
 
 
-class Variables(NamedTuple):
-    pos: P2 = 0, 0
-    from_dir: P2 | None = None
-    seg_length: int = 0
+def crucible_modes(segment_range: Range) -> Modes:
+    """
+    Direction the crucible moves in & length of the straight segment so far.
 
+    Mode d * (max_segment + 1) + length, with an extra mode for (not having moved at)
+    the start.
+    """
+    min_segment, max_segment = segment_range
+    n = max_segment + 1
+    start = 4 * n
 
-DIRS: dict[P2 | None, list[P2]] = {
-    LEFT: [LEFT, UP, DOWN],
-    RIGHT: [RIGHT, UP, DOWN],
-    UP: [UP, LEFT, RIGHT],
-    DOWN: [DOWN, LEFT, RIGHT],
-    None: [UP, DOWN, LEFT, RIGHT],
-}
+    def can_turn(seg_length: int) -> bool:
+        return not 0 < seg_length < min_segment
 
+    def step(mode: int, d: int) -> int | None:
+        if mode == start:
+            return d * n + 1
+        from_d, seg_length = divmod(mode, n)
+        if d == from_d:
+            return mode + 1 if seg_length < max_segment else None
+        if d == (from_d + 2) % 4 or not can_turn(seg_length):
+            return None
+        return d * n + 1
 
-class LavaState(DijkstraState[Constants, Variables]):
-    @property
-    def is_end_state(self) -> bool:
-        return (
-            self.v.pos == self.c.end and not 0 < self.v.seg_length < self.c.min_segment
-        )
-
-    @property
-    def next_states(self) -> Iterator[Self]:
-        x, y = self.v.pos
-        for dx, dy in DIRS[self.v.from_dir]:
-            pos = x + dx, y + dy
-            same_dir = (dx, dy) == self.v.from_dir
-            new_seg_length = self.v.seg_length + 1 if same_dir else 1
-            if (
-                (pos in self.c.grid)
-                and (new_seg_length <= self.c.max_segment)
-                and (same_dir or not 0 < self.v.seg_length < self.c.min_segment)
-            ):
-                yield self.move(
-                    Variables(pos, from_dir=(dx, dy), seg_length=new_seg_length),
-                    distance=self.c.grid[pos],
-                )
+    return Modes(start + 1, step, start, lambda mode: can_turn(mode % n))
 
 
 class _Problem(NumGridProblem[int], ABC):
+    cache_input = True
     segment_range: Range
 
     def solution(self) -> int:
-        path = LavaState.find_path(
-            Variables(), Constants(self.grid, self.segment_range)
-        )
-        log.lazy_debug(
-            lambda: self.grid.to_lines(highlighted={s.v.pos for s in path.states})
+        graph = GridGraph.from_grid(self.grid)
+        w, h = graph.size
+        path = graph.dijkstra(
+            (0, 0), (w - 1, h - 1), crucible_modes(self.segment_range)
         )
+        log.lazy_debug(lambda: self.grid.to_lines(highlighted=set(path.path)))
         return path.length
 
 
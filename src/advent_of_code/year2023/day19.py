@@ -1,15 +1,17 @@
 from abc import ABC
-from math import prod
 from operator import gt, lt
 from typing import TYPE_CHECKING
 
 from more_itertools import split_at
 
 from advent_of_code.problems import MultiLineProblem
+from advent_of_code.utils.intervals import intersect_boxes, volume
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+    from advent_of_code.utils.intervals import Box
+
 type Check = tuple[str, str, int]
 type Rule = tuple[Check, str]
 type Workflow = tuple[list[Rule], str]
@@ -75,6 +77,17 @@ def inverse_check(check: Check) -> Check:
     return (r, ">", v - 1) if op == "<" else (r, "<", v + 1)
 
 
+CATEGORIES = "xmas"
+RATING_RANGE = 1, 4001
+ALL_RATINGS: Box = (RATING_RANGE,) * len(CATEGORIES)
+
+
+def passing_ratings(check: Check) -> Box:
+    r, op, v = check
+    passing = (1, v) if op == "<" else (v + 1, 4001)
+    return tuple(passing if c == r else RATING_RANGE for c in CATEGORIES)
+
+
 class Problem2(_Problem):
     test_solution = 167409079868000
     puzzle_solution = 121464316215623
@@ -99,13 +112,12 @@ class Problem2(_Problem):
         traverse(self.workflows["in"], [])
 
         def combinations(checks: list[Check]) -> int:
-            d = {c: [1, 4000] for c in "xmas"}
-            for r, op, v in checks:
-                if op == "<":
-                    d[r][1] = min(d[r][1], v - 1)
-                else:
-                    d[r][0] = max(d[r][0], v + 1)
-            return prod(v_max - v_min + 1 for v_min, v_max in d.values())
+            box = ALL_RATINGS
+            for check in checks:
+                if not (overlap := intersect_boxes(box, passing_ratings(check))):
+                    return 0
+                box = overlap
+            return volume(box)
 
         return sum(combinations(acc) for acc in accepted_paths)
 
@@ -1,42 +1,104 @@
 from abc import ABC
-from typing import TYPE_CHECKING, NamedTuple, Self
+from functools import cached_property
+from math import lcm
+from typing import TYPE_CHECKING
 
-from based_utils.algo import BFSState
 from based_utils.iterators import repeat_transform
 from more_itertools import last
 
 from advent_of_code import log
 from advent_of_code.problems import CharGridProblem
+from advent_of_code.utils.geo2d import neighbors_2
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
-
     from advent_of_code.utils.geo2d import P2, CharGrid2
 
 
-class Constants(NamedTuple):
-    grid: CharGrid2
-    steps: int
-
-
-class Variables(NamedTuple):
-    pos: P2
-    count_me: bool
-
-
-class GardenState(BFSState[Constants, Variables]):
-    @property
-    def is_end_state(self) -> bool:
-        return self.cost > self.c.steps
-
-    @property
-    def next_states(self) -> Iterator[Self]:
-        for pos, v in self.c.grid.neighbors(self.v.pos):
-            if v != "#":
-                yield self.move(Variables(pos, count_me=not self.v.count_me))
+class GardenWalk:
+    """
+    Number of garden plots that can be reached in an exact number of steps.
+
+    A single BFS is expanded one layer (plots at a distance of exactly n) at a time.
+    Plots reachable in exactly n steps are the ones at a distance <= n of the same
+    parity as n, as every step can be undone with the next one.
+    The grid is bipartite, so the next layer is made up of the neighbors of the
+    current one that weren't in the previous one.
+
+    On a cyclic grid, the size of the layers eventually grows by a fixed amount
+    per period (of repeating tiles), for every offset within that period.
+    From then on, the count for any number of steps can be extrapolated.
+    """
+
+    def __init__(self, grid: CharGrid2, start: P2) -> None:
+        self.plots = grid.points_where(lambda v: v != "#")
+        self.cyclic = grid.cyclic
+        self.origin = grid.origin
+        self.size = w, h = grid.size
+        # Taking an even period keeps the parity of the distances over a period.
+        period = lcm(w, h)
+        self.period = period if period % 2 == 0 else period * 2
+
+        self._previous: set[P2] = set()
+        self._frontier = {start}
+        self.layers = [1]
+        # Plots at a distance <= n with the same parity as n
+        self._reachable = [1]
+        self._is_stable = False
+
+    def _is_plot(self, pos: P2) -> bool:
+        if not self.cyclic:
+            return pos in self.plots
+        (x, y), (x_lo, y_lo), (w, h) = pos, self.origin, self.size
+        return ((x - x_lo) % w + x_lo, (y - y_lo) % h + y_lo) in self.plots
+
+    def _expand(self) -> None:
+        frontier = {
+            n for p in self._frontier for n in neighbors_2(p) if self._is_plot(n)
+        }
+        frontier -= self._previous
+        self._previous, self._frontier = self._frontier, frontier
+        n = len(self.layers)
+        self.layers.append(len(frontier))
+        self._reachable.append(len(frontier) + (self._reachable[n - 2] if n > 1 else 0))
+
+        # Stable when the growth per period is the same over the last two periods.
+        p = self.period
+        if (
+            not self._is_stable
+            and n >= 3 * p
+            and all(
+                self.layers[k] - self.layers[k - p]
+                == self.layers[k - p] - self.layers[k - 2 * p]
+                for k in range(n - p + 1, n + 1)
+            )
+        ):
+            self._is_stable = True
+
+    def reachable(self, steps: int) -> int:
+        while steps >= len(self.layers) and not self._is_stable:
+            self._expand()
+        if steps < len(self.layers):
+            return self._reachable[steps]
+
+        # Within the last period computed, layer n + i * period (i > 0) has size
+        # layers[n] + i * growth[n].
+        p, last_n = self.period, len(self.layers) - 1
+        start = last_n - p + 1
+        total = self._reachable[last_n - (steps - last_n) % 2]
+        for n in range(start, start + p):
+            if (steps - n) % 2:
+                continue
+            growth = self.layers[n] - self.layers[n - p]
+            # Number of periods beyond the last computed one, up to the given steps
+            i = (steps - n) // p
+            if i > 0:
+                total += i * self.layers[n] + growth * i * (i + 1) // 2
+        return total
 
 
 class _Problem(CharGridProblem[int], ABC):
+    cache_input = True
+
     def __init__(self) -> None:
         self.start = self.grid.point_with_value("S")
 
@@ -46,11 +108,12 @@ class _Problem(CharGridProblem[int], ABC):
 
         return len(last(repeat_transform({self.start}, transform=step, times=steps)))
 
+    @cached_property
+    def walk(self) -> GardenWalk:
+        return GardenWalk(self.grid, self.start)
+
     def num_garden_plots(self, steps: int) -> int:
-        path = GardenState.find_path(
-            Variables(self.start, steps % 2 == 0), Constants(self.grid, steps)
-        )
-        return sum(s.v.count_me for s in path.visited_states)
+        return self.walk.reachable(steps)
 
 
 class Problem1(_Problem):
@@ -75,19 +138,15 @@ class Problem2(_Problem):
                 (100, 6536),
                 (500, 167004),
                 (1000, 668697),
-            ]:  # (5000, 16733044)
+                (5000, 16733044),
+            ]:
                 ans = self.num_garden_plots(i)
                 log.info(
                     f"Checking input {i}: {s} == {ans} -> {'👌' if ans == s else 'Nope'}"
                 )
             return 0
 
-        size, (center, _) = self.grid.width, self.start
-        c, u1, u2 = (self.num_garden_plots(center + size * i) for i in range(3))
-        b = (u1 * 4 - u2 - c * 3) / 2
-        a = u1 - b - c
-        n = (26501365 - center) / size
-        return round(n**2 * a + n * b + c)
+        return self.num_garden_plots(26501365)
 
 
 TEST_INPUT = """
@@ -2,7 +2,7 @@ from abc import ABC
 from typing import TYPE_CHECKING
 
 from advent_of_code import log
-from advent_of_code.problems import ParsedProblem
+from advent_of_code.problems import ParsedProblem, shared_property
 from advent_of_code.utils.geo3d import P3D
 
 if TYPE_CHECKING:
@@ -47,13 +47,15 @@ class Brick:
 class _Problem(ParsedProblem[tuple[P3D, P3D], int], ABC):
     line_pattern = "{:p3}~{:p3}"
 
-    def __init__(self) -> None:
-        self.bricks = sorted(
+    @shared_property
+    def bricks(self) -> list[Brick]:
+        """All bricks, after they've settled (on top of each other)."""
+        bricks = sorted(
             [Brick(p_min, p_max + P3D.unity()) for p_min, p_max in self.parsed_input]
         )
-        log.debug(self.bricks)
+        log.debug(bricks)
         tops: dict[P2, Brick] = {}
-        for brick in self.bricks:
+        for brick in bricks:
             bricks_below: set[Brick] = {
                 b
                 for x in range(brick.p_min.x, brick.p_max.x)
@@ -69,6 +71,7 @@ class _Problem(ParsedProblem[tuple[P3D, P3D], int], ABC):
             for x in range(brick.p_min.x, brick.p_max.x):
                 for y in range(brick.p_min.y, brick.p_max.y):
                     tops[x, y] = brick
+        return bricks
 
 
 class Problem1(_Problem):
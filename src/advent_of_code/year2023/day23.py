@@ -3,18 +3,20 @@ from functools import cached_property
 from itertools import pairwise
 from typing import TYPE_CHECKING
 
-from igraph import EdgeSeq, Graph, Layout, plot  # type: ignore[import-untyped]
-from matplotlib import pyplot as plt
+from igraph import Graph  # type: ignore[import-untyped]
 
 from advent_of_code import log
 from advent_of_code.problems import CharGridProblem
 from advent_of_code.utils.geo2d import DOWN, P2, RIGHT, CharGrid2
 
 if TYPE_CHECKING:
+    from igraph import EdgeSeq
     from matplotlib.axes import Axes
 
 
 class _Problem(CharGridProblem[int], ABC):
+    cache_input = True
+
     def __init__(self) -> None:
         self.road = CharGrid2({p: v for p, v in self.grid.items() if v != "#"})
         self.ps = list(self.road.keys())
@@ -45,6 +47,9 @@ class _Problem(CharGridProblem[int], ABC):
         pass
 
     def _plot(self, edges: EdgeSeq) -> None:
+        # Only used for debugging, and slow to import
+        from matplotlib import pyplot as plt  # noqa: PLC0415
+
         fig, ax = plt.subplots()
         self._plot_graph(ax, edges)
         plt.gca().invert_yaxis()
@@ -90,6 +95,8 @@ class Problem1(_Problem):
         return len(edges)
 
     def _plot_graph(self, ax: Axes, edges: EdgeSeq) -> None:
+        from igraph import Layout, plot  # noqa: PLC0415
+
         plot(
             self._graph,
             target=ax,
@@ -144,6 +151,8 @@ class Problem2(_Problem):
         return sum(edges["weight"])
 
     def _plot_graph(self, ax: Axes, edges: EdgeSeq) -> None:
+        from igraph import Layout, plot  # noqa: PLC0415
+
         longest_es = [
             e
             for pe in edges
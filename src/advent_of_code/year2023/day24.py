@@ -11,6 +11,7 @@ type Trajectory = tuple[P3D, P3D]
 
 class _Problem(ParsedProblem[Trajectory, int], ABC):
     line_pattern = "{:p3} @ {:p3}"
+    cache_input = True
 
     def __init__(self) -> None:
         self.hailstone_pairs = set(combinations(self.parsed_input, 2))
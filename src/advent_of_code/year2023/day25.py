@@ -1,6 +1,5 @@
 from math import prod
 
-from igraph import Graph  # type: ignore[import-untyped]
 from ternimator import AnimParams, animate
 from ternimator.animations import animated_lines, flashing
 
@@ -12,6 +11,9 @@ class Problem1(MultiLineProblem[int]):
     puzzle_solution = 582590
 
     def solution(self) -> int:
+        # Only needed here, and slow to import
+        from igraph import Graph  # type: ignore[import-untyped]  # noqa: PLC0415
+
         # graph = Graph.ListDict({line[:3]: line[5:].split() for line in self.lines})
         # vs, *_ = graph.mincut().partition
         # plot(
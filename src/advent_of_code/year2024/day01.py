@@ -7,6 +7,7 @@ from advent_of_code.problems import ParsedProblem
 
 class _Problem(ParsedProblem[tuple[int, int], int], ABC):
     line_pattern = "{:d}   {:d}"
+    cache_input = True
 
     @abstractmethod
     def _compare(self, n1: int, n2: int) -> int:
@@ -30,6 +31,7 @@ class Problem1(_Problem):
 class Problem2(_Problem):
     test_solution = 31
     puzzle_solution = None
+    is_unfinished = True
 
     def _compare(self, n1: int, n2: int) -> int:
         return abs(n1 - n2)
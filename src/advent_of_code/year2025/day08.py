@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
 class _Problem(ParsedProblem[tuple[int, int, int], int], ABC):
     line_pattern = "{:d},{:d},{:d}"
+    cache_input = True
 
     def __init__(self) -> None:
         boxes = [P3D(x, y, z) for x, y, z in self.parsed_input]
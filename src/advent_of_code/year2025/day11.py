@@ -11,6 +11,7 @@ class _Problem(MultiLineProblem[int], ABC):
 class Problem1(_Problem):
     test_solution = None
     puzzle_solution = None
+    is_unfinished = True
 
     def solution(self) -> int:
         return 0
@@ -19,6 +20,7 @@ class Problem1(_Problem):
 class Problem2(_Problem):
     test_solution = None
     puzzle_solution = None
+    is_unfinished = True
 
     def solution(self) -> int:
         return 0